@@ -3,15 +3,33 @@ config.py
 
 This module defines the default sensor configuration and provides
 helper functions to save and load the sensor configuration using QSettings.
-On Windows, QSettings stores configuration data in the registry.
+On Windows, QSettings stores configuration data in the registry. Each sensor
+is stored as an entry of a native QSettings array; older releases stored a
+single JSON string, which is migrated on first load.
 """
 
+import importlib.util
 import json
-import copy
 import logging
 import threading
-from typing import Any, List, Dict
-from PyQt5.QtCore import QSettings
+from collections import deque
+from typing import Any, Deque, Final, List, Dict, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtCore import QSettings, QThreadPool
+
+# orjson is optional; it is much faster than the stdlib json module. _dumps
+# returns bytes either way, as produced natively by orjson.
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
 
 # Set up a module-level logger.
 logger = logging.getLogger(__name__)
@@ -22,7 +40,36 @@ CONFIG_LOCK = threading.Lock()
 # QSettings organization and application names
 ORGANIZATION_NAME = 'HydroPulse'
 APPLICATION_NAME = 'HydroPulseApp'
-SETTINGS_KEY_SENSOR_CONFIG = "sensor_config"
+SETTINGS_KEY_SENSOR_CONFIG = "sensor_config"  # Legacy JSON string
+SETTINGS_KEY_SENSORS = "sensors"  # QSettings array, one entry per sensor
+SETTINGS_KEY_SAVE_FORMAT = "save_format"  # File format for saved data
+
+# File formats for saved data. Parquet needs pyarrow and is the default when
+# it is installed; CSV otherwise. Excel output is slow for long sessions
+# and only used when chosen in the settings.
+SAVE_FORMATS = ("parquet", "csv", "xlsx")
+DEFAULT_SAVE_FORMAT: Final[str] = (
+    "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+)
+
+# Fields stored for each sensor and those read back as numbers (INI files
+# and the registry may return them as strings).
+SENSOR_FIELDS = (
+    "channel", "name", "scale", "color", "style", "calibration", "offset"
+)
+NUMERIC_SENSOR_FIELDS = frozenset(
+    {"channel", "scale", "calibration", "offset"}
+)
+# Fields every stored sensor must have.
+REQUIRED_SENSOR_FIELDS = frozenset({"channel", "name", "scale", "color"})
+
+# Runs settings writes one at a time, in submission order; see
+# config_writer().
+_config_writer: Optional[QThreadPool] = None
+# The last configuration read from or written to the settings, so repeated
+# loads and unchanged saves skip the registry entirely.
+_cached_config: Optional[List[Dict[str, Any]]] = None
+_cached_config_bytes: Optional[bytes] = None
 
 # ===== Default sensor configuration ======================================= #
 # Each dictionary represents a sensor with its parameters such as channel no,
@@ -69,18 +116,94 @@ sensor_config: List[Dict[str, Any]] = [
 # ========================================================================== #
 # Sensor Polling Constants
 # ========================================================================== #
-ADC_MAX = 4095
-VOLTAGE_FULL_SCALE = 10
-POLL_INTERVAL_MS = 100  # Polling interval in milliseconds
+ADC_MAX: Final[int] = 4095
+VOLTAGE_FULL_SCALE: Final[int] = 10
+POLL_INTERVAL_MS: Final[int] = 100  # Polling interval in milliseconds
+# Readings are batched and handed to the UI at most this often.
+EMIT_INTERVAL_MS: Final[int] = 250
+# New readings are drawn at most this often (20 Hz).
+PLOT_REFRESH_MS: Final[int] = 50
+# Upper bound for the poll interval while reads keep failing.
+MAX_BACKOFF_MS: Final[int] = 4000
+# Channels at most this far apart are read in the same Modbus request.
+MAX_REGISTER_GAP: Final[int] = 4
+# Pause before each retry of a failed Modbus read; the last entry repeats.
+# An RTU device recovers from a bus collision within milliseconds.
+RETRY_DELAYS_MS: Final[Tuple[int, ...]] = (5, 20, 100)
 
 # ========================================================================== #
 # Plotting and UI Constants
 # ========================================================================== #
-Y_AXIS_MAX = 1150
-TIME_WINDOW_SEC = 300  # 5 minutes
+Y_AXIS_MAX: Final[int] = 1150
+TIME_WINDOW_SEC: Final[int] = 300  # 5 minutes
 
 # Define a maximum number of points to store corresponding to a 5-mi window.
-MAX_POINTS = int(TIME_WINDOW_SEC * 1000 / POLL_INTERVAL_MS)
+MAX_POINTS: Final[int] = TIME_WINDOW_SEC * 1000 // POLL_INTERVAL_MS
+
+# Readings per block of the full-session store; the session grows by one
+# preallocated block at a time.
+SESSION_BLOCK_SIZE: Final[int] = 65536
+
+
+def make_buffer(maxlen: Optional[int] = MAX_POINTS) -> Deque[Any]:
+    """
+    Create an empty buffer for sensor readings or timestamps.
+
+    Args:
+        maxlen: The maximum number of entries kept; the oldest entry is
+        dropped on append once full. Use None for an unbounded buffer
+        (full session data).
+
+    Returns:
+        A deque with O(1) append and eviction.
+    """
+    return deque(maxlen=maxlen)
+
+
+def copy_sensor_config(
+    config: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Return an independent copy of a sensor configuration.
+
+    Sensor values are primitives, so copying each dict is as safe as a deep
+    copy and much cheaper.
+    """
+    return [dict(sensor) for sensor in config]
+
+
+def build_soa(config: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Build one array per numeric sensor field from a sensor configuration.
+
+    Args:
+        config: List of sensor configuration dictionaries; "scale" is
+        required, the other fields fall back to their defaults.
+
+    Returns:
+        A dict with "channel" (intp), "scale", "calibration" and "offset"
+        (float64) arrays, each with one entry per sensor.
+
+    Raises:
+        KeyError: If a sensor has no "scale".
+        TypeError, ValueError: If a field is not numeric.
+    """
+    return {
+        "channel": np.array(
+            [int(sensor.get("channel", 1)) for sensor in config],
+            dtype=np.intp,
+        ),
+        "scale": np.array(
+            [sensor["scale"] for sensor in config], dtype=np.float64
+        ),
+        "calibration": np.array(
+            [sensor.get("calibration", 1) for sensor in config],
+            dtype=np.float64,
+        ),
+        "offset": np.array(
+            [sensor.get("offset", 0) for sensor in config], dtype=np.float64
+        ),
+    }
 
 
 def validate_config(config: List[Dict[str, Any]]) -> bool:
@@ -94,8 +217,103 @@ def validate_config(config: List[Dict[str, Any]]) -> bool:
     Returns:
         True if all dicts have the keys; False otherwise.
     """
-    required_keys = {"channel", "name", "scale", "color"}
-    return all(required_keys.issubset(sensor.keys()) for sensor in config)
+    return all(REQUIRED_SENSOR_FIELDS <= sensor.keys() for sensor in config)
+
+
+def _get_settings() -> QSettings:
+    """
+    Create a QSettings object for the application settings.
+
+    QSettings is reentrant but not thread-safe, so each call gets its own
+    object, used only on the calling thread. Callers must hold CONFIG_LOCK.
+    """
+    return QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+
+
+def config_writer() -> QThreadPool:
+    """
+    Return the thread pool for settings writes.
+
+    It has a single thread, so writes submitted to it (for example a reset
+    followed by a save) run one at a time and in order, off the GUI thread.
+    """
+    global _config_writer
+    if _config_writer is None:
+        _config_writer = QThreadPool()
+        _config_writer.setMaxThreadCount(1)
+    return _config_writer
+
+
+def _to_number(value: Any) -> Any:
+    """
+    Convert a numeric setting read back as a string to an int or float.
+    """
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    return value
+
+
+def _read_sensor_array(settings: QSettings) -> List[Dict[str, Any]]:
+    """
+    Read the sensor array written by _write_sensor_array.
+
+    The keys follow the layout of QSettings.beginWriteArray ("size" plus
+    1-based entries), so they are read with plain value() calls.
+    """
+    size = int(settings.value(f"{SETTINGS_KEY_SENSORS}/size", 0) or 0)
+    config = []
+    for i in range(1, size + 1):
+        sensor = {}
+        for field in SENSOR_FIELDS:
+            value = settings.value(f"{SETTINGS_KEY_SENSORS}/{i}/{field}")
+            if value is None:
+                continue
+            if field in NUMERIC_SENSOR_FIELDS:
+                value = _to_number(value)
+            sensor[field] = value
+        config.append(sensor)
+    return config
+
+
+def _write_sensor_array(
+    settings: QSettings, config: List[Dict[str, Any]]
+) -> None:
+    """
+    Store each sensor as an entry of the QSettings sensor array.
+    """
+    settings.remove(SETTINGS_KEY_SENSORS)
+    for i, sensor in enumerate(config, start=1):
+        for field in SENSOR_FIELDS:
+            if field in sensor:
+                settings.setValue(
+                    f"{SETTINGS_KEY_SENSORS}/{i}/{field}", sensor[field]
+                )
+    settings.setValue(f"{SETTINGS_KEY_SENSORS}/size", len(config))
+
+
+def _read_legacy_config(settings: QSettings) -> List[Dict[str, Any]]:
+    """
+    Read a configuration stored as a JSON string by older releases.
+
+    A valid legacy configuration is migrated to the sensor array.
+    """
+    config_str = settings.value(SETTINGS_KEY_SENSOR_CONFIG, "")
+    if not config_str:
+        return []
+    try:
+        config = _loads(config_str)
+    except Exception as e:
+        logger.error("Error parsing config: %s", e)
+        return []
+    if not validate_config(config):
+        return config  # Rejected by the caller
+    _write_sensor_array(settings, config)
+    settings.remove(SETTINGS_KEY_SENSOR_CONFIG)
+    logger.info("Migrated stored sensor config to the QSettings array")
+    return config
 
 
 def load_sensor_config(
@@ -104,46 +322,103 @@ def load_sensor_config(
     """
     Load the sensor configuration from the system registry using QSettings.
 
+    The parsed configuration is cached in memory, so only the first call
+    reads the registry, and later calls do not take CONFIG_LOCK.
+
     Args:
         default_config: The default sensor configuration to use if no
         configuration is stored or if there is an error during loading.
 
     Returns:
-        The stored sensor configuration if available and valid,
+        A copy of the stored sensor configuration if available and valid,
         otherwise a copy of the def configuration.
     """
+    global _cached_config, _cached_config_bytes
+    # The cached list is only ever replaced, never modified, so a hit can
+    # be served without waiting for a save running on another thread.
+    cached = _cached_config
+    if cached is not None:
+        return copy_sensor_config(cached)
     with CONFIG_LOCK:
-        settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
-        config_str = settings.value(SETTINGS_KEY_SENSOR_CONFIG, "")
-        if config_str:
+        if _cached_config is None:
             try:
-                loaded_config = json.loads(config_str)
-                if validate_config(loaded_config):
-                    return loaded_config
-                logger.error("Invalid config format, using defaults")
+                settings = _get_settings()
+                loaded_config = (
+                    _read_sensor_array(settings)
+                    or _read_legacy_config(settings)
+                )
             except Exception as e:
-                logger.error("Error parsing config: %s", e)
-        else:
-            logger.info("No stored config found, using defaults")
+                logger.error("Error reading config: %s", e)
+                loaded_config = []
+            if not loaded_config:
+                logger.info("No stored config found, using defaults")
+            elif validate_config(loaded_config):
+                _cached_config = loaded_config
+                _cached_config_bytes = _dumps(loaded_config)
+            else:
+                logger.error("Invalid config format, using defaults")
+        if _cached_config is not None:
+            return copy_sensor_config(_cached_config)
         # Return a fresh copy of the defaults if loading fails
-        return copy.deepcopy(default_config)
+        return copy_sensor_config(default_config)
 
 
 def save_sensor_config(config: List[Dict[str, Any]]) -> None:
     """
     Save the sensor configuration to the system registry using QSettings.
 
+    The write is skipped when the configuration matches the one last
+    loaded or saved.
+
     Args:
         config: A list of dictionaries containing sensor configurations.
     """
+    global _cached_config, _cached_config_bytes
     with CONFIG_LOCK:
-        settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
         try:
-            config_str = json.dumps(config)
-            settings.setValue(SETTINGS_KEY_SENSOR_CONFIG, config_str)
+            config_bytes = _dumps(config)
+            if config_bytes == _cached_config_bytes:
+                return
+            settings = _get_settings()
+            _write_sensor_array(settings, config)
+            # Write through on this thread; a deferred flush would run on
+            # whichever thread owns the settings' event loop.
+            settings.sync()
         except Exception as e:
             logger.error("Error saving config: %s", e)
             raise
+        _cached_config = copy_sensor_config(config)
+        _cached_config_bytes = config_bytes
+
+
+def reset_sensor_config() -> None:
+    """
+    Remove the stored sensor configuration so the defaults apply again.
+    """
+    global _cached_config, _cached_config_bytes
+    with CONFIG_LOCK:
+        settings = _get_settings()
+        settings.remove(SETTINGS_KEY_SENSORS)
+        settings.remove(SETTINGS_KEY_SENSOR_CONFIG)
+        settings.sync()
+        _cached_config = None
+        _cached_config_bytes = None
+
+
+def load_save_format() -> str:
+    """
+    Return the file format for saved data: the stored save_format setting
+    if it names one of SAVE_FORMATS, otherwise DEFAULT_SAVE_FORMAT.
+    """
+    with CONFIG_LOCK:
+        value = _get_settings().value(SETTINGS_KEY_SAVE_FORMAT)
+    value = str(value).lower() if value else ""
+    if value not in SAVE_FORMATS:
+        return DEFAULT_SAVE_FORMAT
+    if value == "parquet" and DEFAULT_SAVE_FORMAT != "parquet":
+        logger.warning("pyarrow is not installed; saving as CSV instead")
+        return "csv"
+    return value
 
 
 if __name__ == "__main__":
@@ -7,15 +7,31 @@ configurations. Changes are saved persistently using QSettings.
 """
 
 import logging
+from collections import Counter
 from itertools import cycle
 from typing import Optional, Tuple, List, Dict, Any
 
-from PyQt5.QtCore import QSettings, QRegExp
+from PyQt5.QtCore import QCoreApplication, QRegularExpression
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5 import QtWidgets
-from PyQt5.QtGui import QIntValidator, QDoubleValidator, QRegExpValidator
-
-from config import save_sensor_config, sensor_config
+from PyQt5.QtGui import (
+    QIntValidator,
+    QDoubleValidator,
+    QRegularExpressionValidator,
+    QShowEvent,
+    QValidator,
+)
+
+from config import (
+    config_writer,
+    copy_sensor_config,
+    make_buffer,
+    reset_sensor_config,
+    save_sensor_config,
+    sensor_config,
+)
+from save_tasks import SaveTask
+from session_store import SessionStore
 
 # Set up a module-level logger.
 logger = logging.getLogger(__name__)
@@ -36,6 +52,62 @@ CANDIDATE_COLORS_LIST: List[str] = [
 
 CANDIDATE_COLORS = cycle(CANDIDATE_COLORS_LIST)
 
+# One bit per candidate color, in list order, so the first free color is
+# the lowest clear bit of the used-color mask.
+_COLOR_BITS: Dict[str, int] = {
+    color: 1 << i for i, color in enumerate(CANDIDATE_COLORS_LIST)
+}
+_ALL_COLORS_MASK = (1 << len(CANDIDATE_COLORS_LIST)) - 1
+
+# Line edits of a sensor row, in column order:
+# (field, default text, max length or 0 for none, tooltip).
+# Channel: integer, 2 digits. Name: letters, digits and spaces.
+# Scale, calibration: >= 1; offset: >= 0. Color: no strict validation.
+_ROW_FIELDS: Tuple[Tuple[str, Any, int, Optional[str]], ...] = (
+    ("channel", 1, 2, None),
+    ("name", "", 16, None),
+    ("scale", "", 6, "Enter the maximum sensor value"),
+    (
+        "calibration",
+        1,
+        6,
+        "Calibration multiplier (e.g., 1.1 = +10% adjustment)",
+    ),
+    ("offset", 0, 6, "Zero-offset adjustment (To zero the raw input)"),
+    ("color", "black", 0, None),
+)
+
+# Sensor names: letters, digits, and spaces. Compiled once at import;
+# QRegularExpression otherwise compiles on the first match.
+_NAME_PATTERN = QRegularExpression("[A-Za-z0-9 ]{0,16}")
+_NAME_PATTERN.optimize()
+
+# Validation rules are fixed, so every sensor row shares one set of
+# validators instead of allocating its own (see _get_validators).
+_VALIDATORS: Dict[str, QValidator] = {}
+
+
+def _get_validators() -> Dict[str, QValidator]:
+    """
+    Return the shared line-edit validators, creating them on first use.
+
+    They are parented to the application instance so they live as long as
+    the application does.
+    """
+    if not _VALIDATORS:
+        app = QCoreApplication.instance()
+        # Channel: integer from 0 to 99.
+        _VALIDATORS["channel"] = QIntValidator(0, 99, app)
+        # Name: letters, digits, and spaces.
+        _VALIDATORS["name"] = QRegularExpressionValidator(_NAME_PATTERN, app)
+        # Scale and calibration: >= 1, offset: >= 0; 2 decimal places.
+        for key, bottom in (("scale", 1), ("calibration", 1), ("offset", 0)):
+            validator = QDoubleValidator(bottom, 1e9, 2, app)
+            # Disallow "e" notation.
+            validator.setNotation(QDoubleValidator.StandardNotation)
+            _VALIDATORS[key] = validator
+    return _VALIDATORS
+
 
 # -------- Sensor Configuration Dialog --------
 class ConfigDialog(QtWidgets.QDialog):
@@ -59,38 +131,55 @@ class ConfigDialog(QtWidgets.QDialog):
         self.sensor_entries: List[Dict[str, Any]] = []
         # Store the default sensor configuration from config.py (for reference)
         self.sensor_config: List[Dict[str, Any]] = sensor_config
-        # Log the loaded sensor configuration
-        logger.debug("Loaded Sensor Config: %s", self.parent.sensor_config)
+        # Log a summary of the loaded sensor configuration
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Loaded Sensor Config: count=%d first=%r",
+                len(self.parent.sensor_config),
+                self.parent.sensor_config[:1],
+            )
         self.changes_made: bool = False  # Flag to track if changes were made
+        # Snapshot to detect a save without edits.
+        self._orig_config: List[Dict[str, Any]] = copy_sensor_config(
+            self.parent.sensor_config
+        )
+        # Colors in use by the parent's config, maintained incrementally.
+        self._used_colors: Counter = Counter()
+        self._used_colors_source: Optional[List[Dict[str, Any]]] = None
+        # Sensor rows are built the first time the dialog is shown.
+        self._populated: bool = False
         self.initUI()
 
+    def showEvent(self, event: QShowEvent) -> None:
+        """
+        Build the sensor rows on first show.
+        """
+        super().showEvent(event)
+        if not self._populated:
+            self._populate_rows()
+
     def initUI(self) -> None:
         """
-        Set up the user interface for the dialog.
+        Set up the header, the sensor row container and the buttons.
+
+        The sensor rows themselves are added by _populate_rows.
         """
         layout = QtWidgets.QVBoxLayout(self)
 
-        # Header layout with labels for each column
-        header_layout = QtWidgets.QHBoxLayout()
-        header_layout.addWidget(QtWidgets.QLabel("Channel"))
-        header_layout.addWidget(QtWidgets.QLabel("Name"))
-        header_layout.addWidget(QtWidgets.QLabel("Scale"))
-        header_layout.addWidget(QtWidgets.QLabel("Calibration"))
-        header_layout.addWidget(QtWidgets.QLabel("Offset"))
-        header_layout.addWidget(QtWidgets.QLabel("Color"))
-        layout.addLayout(header_layout)
-
-        # Container widget for sensor rows with a vertical layout
+        # Container widget for the header and sensor rows. A single grid
+        # keeps the columns aligned and is laid out in one pass.
         self.sensor_rows_widget = QtWidgets.QWidget()
-        self.sensor_rows_layout = QtWidgets.QVBoxLayout(
-            self.sensor_rows_widget
-        )
-        self.sensor_rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.sensor_rows_grid = QtWidgets.QGridLayout(self.sensor_rows_widget)
+        self.sensor_rows_grid.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.sensor_rows_widget)
 
-        # Initialize sensor entries from the parent's configuration
-        for i, sensor in enumerate(self.parent.sensor_config):
-            self.add_sensor_row(sensor, index=i)
+        # Header row with labels for each column
+        for column, title in enumerate(
+            ("Channel", "Name", "Scale", "Calibration", "Offset", "Color")
+        ):
+            self.sensor_rows_grid.addWidget(
+                QtWidgets.QLabel(title), 0, column
+            )
 
         # Button layout for adding, removing, resetting, and saving changes
         btn_layout = QtWidgets.QHBoxLayout()
@@ -113,19 +202,52 @@ class ConfigDialog(QtWidgets.QDialog):
 
         layout.addLayout(btn_layout)
 
+    def _populate_rows(self) -> None:
+        """
+        Add a row for each sensor in the parent's configuration.
+
+        Repaints are suspended while the rows are added, so the dialog is
+        laid out and painted once rather than once per row.
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for i, sensor in enumerate(self.parent.sensor_config):
+                self.add_sensor_row(sensor, index=i)
+        finally:
+            self.setUpdatesEnabled(True)
+        self._populated = True
+
+    def _get_used_colors(self) -> Counter:
+        """
+        Return how often each color is used in the parent's configuration.
+
+        The counts are updated by add_sensor and remove_sensor, and rebuilt
+        only when the parent's configuration list is replaced or its colors
+        are edited through save_changes.
+        """
+        config = self.parent.sensor_config
+        if config is not self._used_colors_source:
+            self._used_colors = Counter(
+                str(sensor.get("color", "")).lower() for sensor in config
+            )
+            self._used_colors_source = config
+        return self._used_colors
+
     def get_unique_color(self) -> str:
         """
-        Return a unique color from the color cycle that is not already used
-        in the parent's sensor configuration.
+        Return the first candidate color that is not already used in the
+        parent's sensor configuration.
         If all candidate colors are used, return the next color in the cycle.
         """
-        used_colors = {sensor["color"] for sensor in self.parent.sensor_config}
-        # Try one full cycle.
-        for _ in range(len(CANDIDATE_COLORS_LIST)):
-            color = next(CANDIDATE_COLORS)
-            if color not in used_colors:
-                return color
-        # After candidate colors; fallback to the next color in the cycle.
+        used = 0
+        for color, count in self._get_used_colors().items():
+            if count > 0:
+                used |= _COLOR_BITS.get(color, 0)
+        free = ~used & _ALL_COLORS_MASK
+        if free:
+            # free & -free isolates the lowest clear bit of the mask.
+            return CANDIDATE_COLORS_LIST[(free & -free).bit_length() - 1]
+        # All candidate colors are used; fallback to the next in the cycle.
         return next(CANDIDATE_COLORS)
 
     def add_sensor_row(
@@ -139,80 +261,31 @@ class ConfigDialog(QtWidgets.QDialog):
             index (int, optional): The index of the sensor in the config. If
         provided, it is used to supply a default channel number if missing.
         """
-        row_layout = QtWidgets.QHBoxLayout()
-
-        # Channel: integer from 0 to 64.
-        default_channel = sensor.get(
-            "channel",
-            index + 1 if index is not None else 1
-        )
-        channel_edit = QtWidgets.QLineEdit(str(default_channel))
-        channel_edit.setValidator(QIntValidator(0, 99, self))
-        channel_edit.setMaxLength(2)
-        row_layout.addWidget(channel_edit)
-
-        # Name: alphanumeric (letters, digits, spaces) up to 16 characters.
-        # Set maximum length directly.
-        name_edit = QtWidgets.QLineEdit(sensor.get("name", ""))
-        name_edit.setMaxLength(16)
-        # Use a regular validator: allow letters, digits, and spaces.
-        name_validator = QRegExpValidator(QRegExp("[A-Za-z0-9 ]{0,16}"), self)
-        name_edit.setValidator(name_validator)
-        row_layout.addWidget(name_edit)
-
-        # Scale: positive number (greater than 0).
-        scale_edit = QtWidgets.QLineEdit(str(sensor.get("scale", "")))
-        # Minimum is a small number; you can adjust the maximum as needed.
-        scale_validator = QDoubleValidator(1, 1e9, 2, self)
-        scale_validator.setNotation(
-            QDoubleValidator.StandardNotation
-        )  # Disallow "e" notation.
-        scale_edit.setValidator(scale_validator)
-        scale_edit.setMaxLength(6)
-        # Add tooltip for scale
-        scale_edit.setToolTip("Enter the maximum sensor value")
-        row_layout.addWidget(scale_edit)
-
-        # Calibration: positive number (greater than 0) with 2 decimal places.
-        calib_edit = QtWidgets.QLineEdit(str(sensor.get("calibration", 1)))
-        calib_validator = QDoubleValidator(1, 1e9, 2, self)
-        calib_validator.setNotation(QDoubleValidator.StandardNotation)
-        calib_edit.setValidator(calib_validator)
-        calib_edit.setMaxLength(6)
-        # Add tooltip for calibration
-        calib_edit.setToolTip(
-            "Calibration multiplier (e.g., 1.1 = +10% adjustment)"
-        )
-        row_layout.addWidget(calib_edit)
-
-        # Offset: number greater than or equal to 0 with 2 decimal places
-        offset_edit = QtWidgets.QLineEdit(str(sensor.get("offset", 0)))
-        offset_validator = QDoubleValidator(0, 1e9, 2, self)
-        offset_validator.setNotation(QDoubleValidator.StandardNotation)
-        offset_edit.setValidator(offset_validator)
-        offset_edit.setMaxLength(6)
-        # Add tooltip for offset
-        offset_edit.setToolTip(
-            "Zero-offset adjustment (To zero the raw input)"
-        )
-        row_layout.addWidget(offset_edit)
-
-        # Color: no strict validation
-        color_edit = QtWidgets.QLineEdit(sensor.get("color", "black"))
-        row_layout.addWidget(color_edit)
+        # Grid row 0 holds the header.
+        row = len(self.sensor_entries) + 1
+        validators = _get_validators()
+        # A missing channel defaults to the sensor's position.
+        defaults = {"channel": index + 1 if index is not None else 1}
+
+        entry: Dict[str, QtWidgets.QLineEdit] = {}
+        for column, (key, default, max_length, tooltip) in enumerate(
+            _ROW_FIELDS
+        ):
+            edit = QtWidgets.QLineEdit(
+                str(sensor.get(key, defaults.get(key, default)))
+            )
+            validator = validators.get(key)
+            if validator is not None:
+                edit.setValidator(validator)
+            if max_length:
+                edit.setMaxLength(max_length)
+            if tooltip:
+                edit.setToolTip(tooltip)
+            self.sensor_rows_grid.addWidget(edit, row, column)
+            entry[key] = edit
 
         # Store the widgets for later retrieval when saving changes
-        self.sensor_entries.append(
-            {
-                "channel": channel_edit,
-                "name": name_edit,
-                "scale": scale_edit,
-                "calibration": calib_edit,
-                "offset": offset_edit,
-                "color": color_edit,
-            }
-        )
-        self.sensor_rows_layout.addLayout(row_layout)
+        self.sensor_entries.append(entry)
 
     def reset_to_default(self) -> None:
         """
@@ -221,15 +294,21 @@ class ConfigDialog(QtWidgets.QDialog):
         This method removes the stored configuration from QSettings and resets
         the parent's configuration, then updates the UI accordingly.
         """
-        # Remove saved sensor configuration from QSettings
-        settings = QSettings("MyCompany", "HydroPowerSensorPlotter")
-        settings.remove("sensor_config")
+        # Remove saved sensor configuration from QSettings in the background.
+        config_writer().start(SaveTask(reset_sensor_config))
         # Revert parent's sensor_config to default values
         global sensor_config  # Use the default configuration from config.py
-        self.parent.sensor_config = sensor_config.copy()
+        self.parent.sensor_config = copy_sensor_config(sensor_config)
+        if self.parent.sensor is not None:
+            self.parent.sensor.sensor_config = self.parent.sensor_config
+            self.parent.sensor.reset_cache()
         # Reset sensor data arrays as well
-        self.parent.sensor_data = [[] for _ in self.parent.sensor_config]
-        self.parent.full_sensor_data = [[] for _ in self.parent.sensor_config]
+        self.parent.sensor_data = [
+            make_buffer() for _ in self.parent.sensor_config
+        ]
+        self.parent.full_session = SessionStore(
+            len(self.parent.sensor_config)
+        )
         # Reinitialize UI elements that depend on configuration
         self.parent.reinitialize_plot_lines()
         self.parent.refresh_statistics_panel()
@@ -255,12 +334,16 @@ class ConfigDialog(QtWidgets.QDialog):
             "style": "-",
         }
         self.parent.sensor_config.append(sensor)
-        self.parent.sensor_data.append([])
-        self.parent.full_sensor_data.append([])
-        # Add the sensor row to the dialog
-        # self.add_sensor_row(sensor)  # Use the helper method to add the row
-        self.add_sensor_row(sensor, index=len(self.parent.sensor_config) - 1)
-        self.sensor_rows_widget.adjustSize()
+        self._used_colors[unique_color] += 1
+        self.parent.sensor_data.append(make_buffer())
+        self.parent.full_session.add_channel()
+        # Add the sensor row to the dialog; before the first show it is
+        # built with the others by _populate_rows.
+        if self._populated:
+            self.add_sensor_row(
+                sensor, index=len(self.parent.sensor_config) - 1
+            )
+            self.sensor_rows_widget.adjustSize()
         self.changes_made = True  # Set flag when a sensor is added
 
     def remove_sensor(self) -> None:
@@ -269,23 +352,18 @@ class ConfigDialog(QtWidgets.QDialog):
         """
         if self.parent.sensor_config:
             # Remove the last sensor configuration and corresponding data
-            self.parent.sensor_config.pop()
+            used_colors = self._get_used_colors()
+            removed = self.parent.sensor_config.pop()
+            used_colors[str(removed.get("color", "")).lower()] -= 1
             self.parent.sensor_data.pop()
-            self.parent.full_sensor_data.pop()
+            self.parent.full_session.remove_channel()
 
             # Remove the last row of sensor entry widgets
             if self.sensor_entries:
                 last_entry = self.sensor_entries.pop()  # Get the last entry
                 for widget in last_entry.values():
-                    widget.deleteLater()  # Remove the widgets from the layout
-
-                # Remove the last row layout from the sensor layout
-                if self.sensor_rows_layout.count() > 0:
-                    item = self.sensor_rows_layout.takeAt(
-                        self.sensor_rows_layout.count() - 1
-                    )
-                    if item and item.layout():
-                        item.layout().deleteLater()
+                    widget.setParent(None)  # Removes it from the grid
+                    widget.deleteLater()
 
             self.changes_made = True  # Set flag when a sensor is removed
 
@@ -302,28 +380,27 @@ class ConfigDialog(QtWidgets.QDialog):
         Returns:
             tuple: (is_valid (bool), error_message (str))
         """
-        # Check that each sensor has a unique channel number.
-        channels = [sensor.get("channel") for sensor in config]
-        if len(channels) != len(set(channels)):
-            return (
-                False,
-                (
-                    "Duplicate sensor channels found. "
-                    "Please ensure each sensor has a unique channel."
-                ),
-            )
-
-        # Check that scale and calibration values are greater than zero.
+        # One pass: each sensor must have a unique channel number and
+        # scale and calibration values greater than zero.
+        seen_channels = set()
         for sensor in config:
-            scale = sensor.get("scale", 0)
-            calibration = sensor.get("calibration", 1)
-            if scale <= 0:
+            channel = sensor.get("channel")
+            if channel in seen_channels:
+                return (
+                    False,
+                    (
+                        "Duplicate sensor channels found. "
+                        "Please ensure each sensor has a unique channel."
+                    ),
+                )
+            seen_channels.add(channel)
+            if sensor.get("scale", 0) <= 0:
                 return (
                     False,
                     f"Scale for sensor '{sensor.get('name', '')}' must be "
                     "greater than zero.",
                 )
-            if calibration <= 0:
+            if sensor.get("calibration", 1) <= 0:
                 return (
                     False,
                     f"Calibration for sensor '{sensor.get('name', '')}' must "
@@ -342,17 +419,17 @@ class ConfigDialog(QtWidgets.QDialog):
         """
         # Initialize the list for auto-correction messages.
         auto_corrected = []
+        config = self.parent.sensor_config
         for i, entry in enumerate(self.sensor_entries):
+            sensor = config[i]
             # Channel: if conversion fails, default to i+1.
             try:
-                self.parent.sensor_config[i]["channel"] = int(
-                    entry["channel"].text()
-                )
+                sensor["channel"] = int(entry["channel"].text())
             except ValueError:
-                self.parent.sensor_config[i]["channel"] = i + 1
+                sensor["channel"] = i + 1
 
             # Name: store the text as entered.
-            self.parent.sensor_config[i]["name"] = entry["name"].text()
+            sensor["name"] = entry["name"].text()
 
             # Scale: must be > 0; if 0 or less, force it to 1.
             try:
@@ -362,10 +439,10 @@ class ConfigDialog(QtWidgets.QDialog):
                     auto_corrected.append(
                         f"Sensor {i+1} scale auto-corrected to 1."
                     )
-                self.parent.sensor_config[i]["scale"] = scale_value
+                sensor["scale"] = scale_value
             except ValueError:
                 # Use a default value
-                self.parent.sensor_config[i]["scale"] = 600
+                sensor["scale"] = 600
 
             # Calibration: must be > 0; if 0 or less, force it to 1.
             try:
@@ -375,20 +452,21 @@ class ConfigDialog(QtWidgets.QDialog):
                     auto_corrected.append(
                         f"Sensor {i+1} calibration auto-corrected to 1."
                     )
-                self.parent.sensor_config[i]["calibration"] = calib_value
+                sensor["calibration"] = calib_value
             except ValueError:
-                self.parent.sensor_config[i]["calibration"] = 1
+                sensor["calibration"] = 1
 
             # Offset: allowed to be 0 or greater.
             try:
-                self.parent.sensor_config[i]["offset"] = float(
-                    entry["offset"].text()
-                )
+                sensor["offset"] = float(entry["offset"].text())
             except ValueError:
-                self.parent.sensor_config[i]["offset"] = 2
+                sensor["offset"] = 2
 
             # Color: store the text.
-            self.parent.sensor_config[i]["color"] = entry["color"].text()
+            sensor["color"] = entry["color"].text()
+
+        # Colors may have been edited; recount them on next use.
+        self._used_colors_source = None
 
         # Inform the user about any auto-corrections.
         if auto_corrected:
@@ -399,36 +477,37 @@ class ConfigDialog(QtWidgets.QDialog):
                 "\n".join(auto_corrected)
             )
 
+        # Nothing was edited: skip the write and the plot updates.
+        if (
+            not self.changes_made
+            and self.parent.sensor_config == self._orig_config
+        ):
+            self.accept()
+            return
+
         # --- Additional Validation Step ---
         valid, error_message = self.validate_config(self.parent.sensor_config)
         if not valid:
             QMessageBox.warning(self, "Validation Error", error_message)
             return  # Do not proceed with saving if validation fails.
 
-        # Save the updated configuration persistently.
-        save_sensor_config(self.parent.sensor_config)
+        # Save the updated configuration persistently in the background.
+        # A snapshot keeps the write independent of later edits.
+        config_snapshot = copy_sensor_config(self.parent.sensor_config)
+        config_writer().start(
+            SaveTask(lambda: save_sensor_config(config_snapshot))
+        )
 
         # --- Begin Property-Specific UI Updates ---
 
         # 1. Update sensor object configuration (if applicable).
         if self.parent.sensor is not None:
             self.parent.sensor.sensor_config = self.parent.sensor_config
+            self.parent.sensor.reset_cache()
 
-        # 2. Update line colors and labels directly.
-        for idx, sensor in enumerate(self.parent.sensor_config):
-            if idx < len(self.parent.lines):
-                # Update color if different.
-                current_color = self.parent.lines[idx].get_color()
-                new_color = sensor["color"]
-                if current_color != new_color:
-                    self.parent.lines[idx].set_color(new_color)
-                # Update label if different.
-                current_label = self.parent.lines[idx].get_label()
-                new_label = sensor["name"]
-                if current_label != new_label:
-                    self.parent.lines[idx].set_label(new_label)
-        # Update the legend to reflect any label changes.
-        self.parent.canvas.ax.legend(loc="upper left")
+        # 2. Apply names, colors and styles to the lines; the legend
+        # entries are updated in place.
+        self.parent.update_line_styles()
 
         # 3. Trigger a plot update to reprocess any numerical changes.
         self.parent.update_plot_ui()
@@ -7,12 +7,12 @@ This module initializes the QApplication, sets the global style and font, and
 launches the main window. It also configures logging to be recorded.
 """
 
+import atexit
 import os
 import logging
+import queue
 import sys
-from PyQt5 import QtWidgets, QtGui
-from ui import SensorPlotter
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Configure logging
 log_formatter = logging.Formatter(
@@ -29,15 +29,31 @@ log_dir = os.path.join(os.getenv("LOCALAPPDATA"), "HydroPulse")
 os.makedirs(log_dir, exist_ok=True)
 log_file_path = os.path.join(log_dir, "hydropulse.log")
 
-# File handler with rotation (max 1MB per file, keep last 3 files)
+# File handler with rotation (max 1MB per file, keep last 3 files).
+# The file is opened on the first record rather than at start-up.
 file_handler = RotatingFileHandler(
-    log_file_path, maxBytes=1_000_000, backupCount=3
+    log_file_path, maxBytes=1_000_000, backupCount=3, delay=True
 )
 file_handler.setFormatter(log_formatter)
 
+# Records are queued by the logging thread and written by a listener thread,
+# so console and file I/O never block the GUI thread.
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log_listener = QueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True
+)
+log_listener.start()
+# Flush the queued records on exit.
+atexit.register(log_listener.stop)
+
+# Queued records carry only the message; the listener's handlers apply
+# log_formatter.
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[console_handler, file_handler]
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger("HydroPulse")
@@ -57,10 +73,38 @@ def handle_exception(exc_type, exc_value, exc_traceback):
 
 sys.excepthook = handle_exception
 
-if __name__ == "__main__":
+
+def main() -> None:
+    """
+    Create the application, show a splash screen, then build the main window.
+
+    The UI module pulls in Matplotlib, pandas and pymodbus, so it is imported
+    only after the QApplication exists and the splash screen is visible.
+    """
+    from PyQt5 import QtCore, QtWidgets, QtGui
+
     app = QtWidgets.QApplication(sys.argv)
     app.setStyle("WindowsVista")
     app.setFont(QtGui.QFont("Segoe UI", 10))
+
+    import resources_rc  # noqa: F401
+
+    splash = QtWidgets.QSplashScreen(QtGui.QPixmap(":/images/myicon.ico"))
+    splash.show()
+    app.processEvents()
+
+    from config import config_writer
+    from ui import SensorPlotter
+
     window = SensorPlotter()
     window.showMaximized()
-    sys.exit(app.exec_())
+    splash.finish(window)
+    exit_code = app.exec_()
+    # Let pending background saves (data and settings) finish before exit.
+    QtCore.QThreadPool.globalInstance().waitForDone()
+    config_writer().waitForDone()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
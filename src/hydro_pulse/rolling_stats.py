@@ -0,0 +1,134 @@
+"""
+rolling_stats.py
+
+This module provides RollingStats, which keeps the minimum, maximum and mean
+of a rolling window of sensor readings up to date as readings are appended
+and evicted, so the statistics panel does not rescan the whole window on
+every refresh.
+"""
+
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+
+class RollingStats:
+    """
+    Running min/max/mean over the readings held in a buffer.
+
+    All changes to the buffer must go through append() and popleft(). The
+    minimum and maximum are kept in monotonic queues of (index, value)
+    pairs, so each update is O(1) amortized. None and NaN entries are stored
+    in the buffer but left out of the statistics.
+
+    Attributes:
+        buffer: The deque (or list) of readings being tracked.
+    """
+
+    __slots__ = (
+        "buffer",
+        "_maxlen",
+        "_size",
+        "_next_index",
+        "_sum",
+        "_count",
+        "_min_q",
+        "_max_q",
+    )
+
+    def __init__(self, buffer: Any) -> None:
+        """
+        Track an existing buffer, taking its current contents into account.
+
+        Args:
+            buffer: A deque, optionally bounded by maxlen, or a list.
+        """
+        self.buffer = buffer
+        self._maxlen: Optional[int] = getattr(buffer, "maxlen", None)
+        self._size = 0
+        # Index of the next appended reading; the oldest reading in the
+        # buffer has index _next_index - _size.
+        self._next_index = 0
+        self._sum = 0.0
+        self._count = 0
+        self._min_q: Deque[Tuple[int, float]] = deque()
+        self._max_q: Deque[Tuple[int, float]] = deque()
+        for value in buffer:
+            self._add(value)
+
+    def in_sync(self, buffer: Any) -> bool:
+        """
+        Check that these statistics still describe the given buffer.
+
+        Returns:
+            bool: False if the buffer was replaced or changed directly.
+        """
+        return buffer is self.buffer and len(buffer) == self._size
+
+    def append(self, value: Optional[float]) -> None:
+        """
+        Append a reading to the buffer, evicting the oldest one if full.
+        """
+        if self._maxlen is not None and self._size == self._maxlen:
+            self._evict(self.buffer[0])
+        self.buffer.append(value)
+        self._add(value)
+
+    def popleft(self) -> None:
+        """
+        Remove the oldest reading from the buffer.
+        """
+        self._evict(self.buffer.popleft())
+
+    def current(self) -> Optional[float]:
+        """
+        Return the newest reading, or None if there is none.
+        """
+        return self.buffer[-1] if self._size else None
+
+    def minimum(self) -> Optional[float]:
+        """
+        Return the smallest valid reading, or None if there is none.
+        """
+        return self._min_q[0][1] if self._min_q else None
+
+    def maximum(self) -> Optional[float]:
+        """
+        Return the largest valid reading, or None if there is none.
+        """
+        return self._max_q[0][1] if self._max_q else None
+
+    def mean(self) -> Optional[float]:
+        """
+        Return the mean of the valid readings, or None if there are none.
+        """
+        return self._sum / self._count if self._count else None
+
+    def _add(self, value: Optional[float]) -> None:
+        index = self._next_index
+        self._next_index += 1
+        self._size += 1
+        if value is None or value != value:
+            return
+        self._sum += value
+        self._count += 1
+        min_q, max_q = self._min_q, self._max_q
+        while min_q and min_q[-1][1] >= value:
+            min_q.pop()
+        min_q.append((index, value))
+        while max_q and max_q[-1][1] <= value:
+            max_q.pop()
+        max_q.append((index, value))
+
+    def _evict(self, value: Optional[float]) -> None:
+        index = self._next_index - self._size
+        self._size -= 1
+        if value is None or value != value:
+            return
+        self._count -= 1
+        # Reset rather than subtract once empty, so rounding errors in the
+        # running sum do not accumulate across windows.
+        self._sum = self._sum - value if self._count else 0.0
+        if self._min_q and self._min_q[0][0] == index:
+            self._min_q.popleft()
+        if self._max_q and self._max_q[0][0] == index:
+            self._max_q.popleft()
@@ -3,7 +3,7 @@ save_tasks.py
 
 This module provides a QRunnable-based task for executing save operations
 in a non-blocking manner using PyQt's QThreadPool. It is used to offload heavy
-file-saving operations (for example, saving Excel files) to background threads,
+file-saving operations (for example, saving data files) to background threads,
 keeping the main UI responsive.
 """
 
@@ -4,24 +4,32 @@ sensor.py - Sensor abstraction for HydroPulse
 This module provides a Sensor class for reading sensor. It processes raw
 sensor values by applying an offset, scaling, and calibration,and returns the
 processed data along with a timestamp. It also defines a SensorError exception
-for handling sensor-related errors.
+for handling sensor-related errors, and a SensorBus that lets several Sensors
+share one Modbus client.
 """
 
-from datetime import datetime
 import logging
+import socket
 import time
 import threading
-from typing import Any, List, Dict, Tuple, Optional
-
-from contextlib import nullcontext
+from typing import Any, List, Dict, Sequence, Tuple, Optional
 
+import numpy as np
 from pymodbus.client import ModbusSerialClient as ModbusClient
+from pymodbus.pdu import ExceptionResponse
 
-from config import ADC_MAX, VOLTAGE_FULL_SCALE
+from config import ADC_MAX, MAX_REGISTER_GAP, RETRY_DELAYS_MS, build_soa
 
 # Set up a module-level logger.
 logger = logging.getLogger(__name__)
 
+# Exception codes with which a device refuses a request outright. Unlike a
+# timeout or a busy device, resending the same request cannot succeed.
+_REJECTION_CODES = (
+    ExceptionResponse.ILLEGAL_ADDRESS,
+    ExceptionResponse.ILLEGAL_VALUE,
+)
+
 
 class SensorError(Exception):
     """Custom exception raised when sensor-related errors occur."""
@@ -29,12 +37,21 @@ class SensorError(Exception):
     pass
 
 
+class ReadCancelled(SensorError):
+    """Raised when a read is abandoned because cancel_reads() was called."""
+
+    pass
+
+
 class Sensor:
     def __init__(
         self,
         sensor_config: List[Dict[str, Any]],
         modbus_client: ModbusClient,
         use_mutex: bool = False,
+        max_gap: int = MAX_REGISTER_GAP,
+        retry_delays: Sequence[int] = RETRY_DELAYS_MS,
+        mutex: Optional[threading.Lock] = None,
     ) -> None:
         """
         Initialize the Sensor abstraction.
@@ -48,117 +65,434 @@ class Sensor:
                     - "calibration": (float) Calibration factor (def: 1)
             modbus_client (ModbusClient): The modbus client for communication.
             use_mutex (bool): Opt; use threading.Lock for thread safety.
+                Off by default: get_reading reuses internal buffers and
+                expects a single calling thread (the SensorWorker). Only
+                enable it if several threads poll the same Sensor.
+            max_gap (int): Channels at most this far apart share one Modbus
+                request; unused registers in between are read and ignored.
+            retry_delays (Sequence[int]): The pause in ms before each retry
+                of a failed read; the last entry is reused for later ones.
+            mutex (threading.Lock): Opt; the lock to use when use_mutex is
+                set, e.g. one shared by all Sensors on a SensorBus.
 
         Raises:
-            SensorError: If modbus_client is not provided.
+            SensorError: If modbus_client is not provided or the sensor
+                configuration is invalid.
         """
         if not modbus_client:
             raise SensorError("Modbus client is not initialized.")
         self.sensor_config = sensor_config
         self.modbus_client = modbus_client
         self.use_mutex = use_mutex
-        self.mutex = threading.Lock() if use_mutex else None
+        self.max_gap = max_gap
+        # Seconds, ready for Event.wait.
+        self._retry_delays = tuple(d / 1000 for d in retry_delays) or (0.0,)
+        if use_mutex and mutex is None:
+            mutex = threading.Lock()
+        self.mutex = mutex if use_mutex else None
+        # Pick the read path once so polls never test use_mutex.
+        if use_mutex:
+            self.get_reading = self._read_locked
+        # Timestamps come from the monotonic clock, shifted once onto the
+        # epoch so they stay comparable with wall-clock time when saved.
+        self._epoch_offset = time.time() - time.monotonic()
+        # Set by cancel_reads() to cut short a retry backoff in progress.
+        self._cancel_event = threading.Event()
+        self._disable_nagle()
+        self.reset_cache()
+
+    def reset_cache(self) -> None:
+        """
+        Rebuild the per-channel arrays used by get_reading.
+
+        The offsets and combined scale/calibration coefficients are derived
+        from config.build_soa and kept as NumPy arrays so a poll is processed
+        in a few vectorized operations.
+        Call this whenever sensor_config is modified.
+
+        Raises:
+            SensorError: If a sensor entry is missing a valid "scale".
+        """
+        try:
+            soa = build_soa(self.sensor_config)
+        except (KeyError, TypeError, ValueError) as e:
+            raise SensorError(f"Invalid sensor configuration: {e}")
+        channels = soa["channel"].tolist()
+        offsets = soa["offset"]
+        # The voltage conversion cancels out, leaving raw * scale * cal / ADC.
+        coefficients = soa["scale"] * soa["calibration"] / ADC_MAX
+        # Swap in a single tuple so a concurrent poll never sees a mix of
+        # old and new arrays. The last two arrays are scratch buffers that
+        # every poll fills in place instead of allocating new ones.
+        self._cache = (
+            channels,
+            offsets,
+            coefficients,
+            self._build_read_plan(channels),
+            np.empty(len(channels)),
+            np.empty(len(channels)),
+        )
+
+    def _build_read_plan(
+        self, channels: List[int]
+    ) -> Tuple[Tuple[int, int, np.ndarray, np.ndarray], ...]:
+        """
+        Group the channels into as few Modbus requests as possible.
+
+        Sorted channels are merged greedily while the gap to the previous
+        channel is at most max_gap.
+
+        Args:
+            channels (list): The 1-based channel of each sensor.
+
+        Returns:
+            One (address, count, sensors, registers) tuple per request:
+            the 0-based start address, the number of registers, the
+            indices of the sensors it serves and, for each of them, the
+            index of its register within the response.
+        """
+        order = sorted(range(len(channels)), key=channels.__getitem__)
+        groups: List[List[int]] = []
+        for i in order:
+            if (
+                groups
+                and channels[i] - channels[groups[-1][-1]] <= self.max_gap
+            ):
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        plan = []
+        for group in groups:
+            first = channels[group[0]]
+            count = channels[group[-1]] - first + 1
+            registers = np.array(
+                [channels[i] - first for i in group], dtype=np.intp
+            )
+            # Modbus uses 0-based addressing.
+            plan.append(
+                (first - 1, count, np.array(group, dtype=np.intp), registers)
+            )
+        return tuple(plan)
+
+    @staticmethod
+    def _split_request(
+        address: int, count: int, sensors: np.ndarray, registers: np.ndarray
+    ) -> List[Tuple[int, int, np.ndarray, np.ndarray]]:
+        """
+        Split a read plan entry the device rejected into smaller requests.
+
+        A request spanning unconfigured registers is split into its
+        contiguous runs of configured registers; a contiguous run is split
+        into single registers.
+
+        Returns:
+            The (address, count, sensors, registers) entries replacing it.
+        """
+        unique = np.unique(registers)
+        if count > len(unique):
+            runs = np.split(unique, np.flatnonzero(np.diff(unique) > 1) + 1)
+        else:
+            runs = [unique[i:i + 1] for i in range(len(unique))]
+        entries = []
+        for run in runs:
+            first, last = int(run[0]), int(run[-1])
+            mask = (registers >= first) & (registers <= last)
+            entries.append(
+                (
+                    address + first,
+                    last - first + 1,
+                    sensors[mask],
+                    registers[mask] - first,
+                )
+            )
+        return entries
+
+    def _split_failed_requests(
+        self, cache: tuple, failed: List[tuple]
+    ) -> None:
+        """
+        Replace the failed entries of cache's read plan with smaller
+        requests, unless the cache was rebuilt in the meantime.
+        """
+        if self._cache is not cache:
+            return
+        plan = []
+        for entry in cache[3]:
+            if any(entry is bad for bad in failed):
+                logger.info(
+                    "Splitting rejected read of registers %s-%s",
+                    entry[0],
+                    entry[0] + entry[1] - 1,
+                )
+                plan.extend(self._split_request(*entry))
+            else:
+                plan.append(entry)
+        self._cache = cache[:3] + (tuple(plan),) + cache[4:]
+
+    def cancel_reads(self) -> None:
+        """
+        Abandon any read in progress and fail further reads.
+
+        A read waiting out a retry backoff raises ReadCancelled at once, so a
+        caller stopping the poll loop does not wait for the backoff to end.
+        """
+        self._cancel_event.set()
+
+    def resume_reads(self) -> None:
+        """
+        Allow reads again after cancel_reads().
+        """
+        self._cancel_event.clear()
+
+    def _disable_nagle(self) -> None:
+        """
+        Send requests immediately on a Modbus/TCP connection.
+
+        With Nagle's algorithm enabled, each small request can wait for the
+        previous reply's ACK, adding tens of ms per poll. Serial clients
+        have no TCP socket and are left untouched. Must be re-applied after
+        every reconnect, as the socket is replaced.
+        """
+        sock = getattr(self.modbus_client, "socket", None)
+        if isinstance(sock, socket.socket) and sock.family in (
+            socket.AF_INET,
+            socket.AF_INET6,
+        ):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError as e:
+                logger.warning("Could not set TCP_NODELAY: %s", e)
+
+    def _ensure_connected(self) -> bool:
+        """
+        Reconnect the Modbus client if its connection has dropped.
+
+        The client is opened once and reused across polls; this only calls
+        connect() when the client reports that it is no longer connected.
+
+        Returns:
+            bool: True if the client is connected.
+        """
+        # Clients without a "connected" attribute are assumed to be open.
+        if getattr(self.modbus_client, "connected", True):
+            return True
+        try:
+            connected = bool(self.modbus_client.connect())
+        except Exception as e:
+            logger.error("Failed to reconnect Modbus client: %s", e)
+            return False
+        if connected:
+            self._disable_nagle()
+        return connected
+
+    def reconnect(self) -> bool:
+        """
+        Reconnect the Modbus client if its connection has dropped.
+
+        Holds the sensor mutex, if any, so the reconnect cannot interleave
+        with a read by another sensor sharing the client.
+
+        Returns:
+            bool: True if the client is connected.
+        """
+        if self.mutex is None:
+            return self._ensure_connected()
+        with self.mutex:
+            return self._ensure_connected()
+
+    def _reconnect(self) -> None:
+        """
+        Close the Modbus client and open it again after a transport error.
+        """
+        try:
+            self.modbus_client.close()
+            if self.modbus_client.connect():
+                self._disable_nagle()
+        except Exception as e:
+            logger.error("Failed to reconnect Modbus client: %s", e)
+
+    def _read_registers(
+        self, address: int, count: int, retries: int = 3
+    ) -> Optional[Any]:
+        """
+        Read holding registers, pausing between attempts per retry_delays.
+
+        Args:
+            address (int): The 0-based start address.
+            count (int): The number of registers to read.
+            retries (int): The number of attempts before giving up.
+
+        Returns:
+            The Modbus response, or None if every attempt failed.
+
+        Raises:
+            ReadCancelled: If cancel_reads() is called during a backoff.
+        """
+        delays = self._retry_delays
+        for attempt in range(1, retries + 1):
+            try:
+                response = self.modbus_client.read_holding_registers(
+                    address=address, count=count, slave=1
+                )
+                if response is not None and not response.isError():
+                    return response
+                logger.error(
+                    "Failed to read address %s on attempt %s",
+                    address,
+                    attempt,
+                )
+            except Exception as e:
+                logger.error(
+                    "Attempt %s: Exception reading address %s: %s",
+                    attempt,
+                    address,
+                    e,
+                )
+                # The transport failed; retry on a fresh connection rather
+                # than on the dead one.
+                self._reconnect()
+            # Back off before retrying, cut short by cancel_reads().
+            if attempt < retries and self._cancel_event.wait(
+                delays[min(attempt, len(delays)) - 1]
+            ):
+                raise ReadCancelled("Sensor read cancelled.")
+        return None
+
+    def _read_block(
+        self, address: int, count: int, registers: np.ndarray
+    ) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Read a run of channels in a single Modbus transaction.
+
+        Args:
+            address (int): The 0-based start address.
+            count (int): The number of registers to read.
+            registers (np.ndarray): The index within the response of each
+                sensor's register.
+
+        Returns:
+            tuple: (values, rejected)
+                values (np.ndarray): The raw register value of each sensor,
+                    or None if the read failed and the caller should fall
+                    back to per-channel reads.
+                rejected (bool): True if the device refused the request
+                    with an illegal address or value exception.
+
+        Raises:
+            SensorError: If the response holds non-numeric register values.
+        """
+        # One attempt only; the per-channel fallback does its own retries.
+        try:
+            response = self.modbus_client.read_holding_registers(
+                address=address, count=count, slave=1
+            )
+        except Exception as e:
+            logger.error("Exception reading address %s: %s", address, e)
+            self._reconnect()
+            return None, False
+        if response is None or response.isError():
+            logger.error("Failed to read address %s", address)
+            rejected = (
+                isinstance(response, ExceptionResponse)
+                and response.exception_code in _REJECTION_CODES
+            )
+            return None, rejected
+        try:
+            values = np.asarray(response.registers, dtype=np.float64)
+            return values[registers], False
+        except (IndexError, TypeError, ValueError):
+            raise SensorError(
+                f"Invalid reading on registers {address}-{address + count - 1}"
+            )
 
-    def get_reading(self) -> Tuple[List[Optional[float]], float]:
+    def _read_channels(self, channels: List[int]) -> np.ndarray:
+        """
+        Read each channel with its own Modbus transaction.
+
+        Args:
+            channels (list): The 1-based sensor channels to read.
+
+        Returns:
+            The raw register value of each sensor, NaN where a channel could
+            not be read.
+
+        Raises:
+            SensorError: If a response holds a non-numeric register value.
+        """
+        # NaN marks channels without a valid reading.
+        raw = np.full(len(channels), np.nan)
+        channel = None
+        # A single handler around the loop instead of one per channel.
+        try:
+            for i, channel in enumerate(channels):
+                # Modbus device uses 0-based addressing
+                response = self._read_registers(channel - 1, 1)
+                if response is not None:
+                    raw[i] = response.registers[0]
+        except (IndexError, TypeError, ValueError):
+            raise SensorError(f"Invalid reading on channel {channel}")
+        return raw
+
+    def _read_unlocked(self) -> Tuple[List[Optional[float]], float]:
         """
         Read sensor data from the Modbus client, process the raw values,
         and return the processed sensor values along with a timestamp.
 
         Returns:
             tuple: (sensor_values, timestamp)
-                sensor_values (list): A list of processed sensor values.
-                timestamp (float): Current timestamp.
+                sensor_values (list): A list of processed sensor values,
+                    with None for channels that could not be read.
+                timestamp (float): Current timestamp in epoch seconds,
+                    advancing monotonically.
 
         Raises:
-            SensorError: If reading from the modbus client fails.
-        """
-        # Use a context manager for mutex handling.
-        # otherwise, use a no-op context.
-        context = (
-            self.mutex
-            if self.use_mutex and self.mutex
-            else nullcontext()
-        )
-        with context:
-            sensor_values: List[Optional[float]] = []
-            # Iterate over each sensor configuration
-            for sensor in self.sensor_config:
-                channel = sensor.get("channel", 1)
-                retries = 3  # Try 3 times
-                attempt = 0
-                response = None
-                reading_obtained = False
-
-                while attempt < retries and not reading_obtained:
-                    try:
-                        # Modbus device uses 0-based addressing
-                        response = self.modbus_client.read_holding_registers(
-                            address=channel - 1, count=1, slave=1
-                        )
-                        # If response is an error, raise a trigger to retry.
-                        if response is None or response.isError():
-                            logger.error(
-                                "Failed to read channel %s on attempt %s",
-                                channel,
-                                attempt + 1,
-                            )
-                            attempt += 1
-                            if attempt >= retries:
-                                break
-                            time.sleep(2**attempt)
-                        else:
-                            reading_obtained = True
-                            # Success: break out of the retry loop.
-                            break
-                    except Exception as e:
-                        logger.error(
-                            (
-                                "Attempt %s: Exception reading sensor on "
-                                "channel %s: %s"
-                            ),
-                            attempt + 1,
-                            channel,
-                            e,
-                        )
-                        attempt += 1
-                        if attempt == retries:
-                            break
-                        time.sleep(2**attempt)  # Exponential backoff
-
-                # Process the response if a valid one was obtained.
-                if reading_obtained:
-                    try:
-                        raw_val = response.registers[0]
-                        # Ensure raw_val is a number
-                        raw_val_numeric = float(raw_val)
-                        # Process the raw value, apply offset,
-                        # convert to voltage, and then apply
-                        # scaling and calibration.
-                        processed_val = max(
-                            0, raw_val_numeric - sensor.get("offset", 0)
-                        )
-                        voltage = (
-                            (processed_val / ADC_MAX)
-                            * VOLTAGE_FULL_SCALE
-                        )
-                        calibration = sensor.get("calibration", 1)
-                        # scale is a mandatory key in sensor configuration.
-                        sensor_value = (
-                            (voltage / VOLTAGE_FULL_SCALE)
-                            * sensor["scale"]
-                            * calibration
-                        )
-                        sensor_values.append(sensor_value)  # <-- Append here
-                    except Exception:
-                        error_msg = (
-                            f"Invalid reading on channel {channel}"
-                        )
-                        raise SensorError(error_msg)
-                else:
-                    # Ensure an entry for each sensor
-                    sensor_values.append(None)
-            current_time = datetime.now().timestamp()
-            return sensor_values, current_time
+            SensorError: If reading from the modbus client fails or the
+                client cannot be reconnected.
+        """
+        if not self._ensure_connected():
+            raise SensorError("Modbus client is not connected.")
+        cache = self._cache
+        _, offsets, coefficients, plan, raw, processed = cache
+        failed = []
+        for entry in plan:
+            address, count, sensors, registers = entry
+            values, rejected = self._read_block(address, count, registers)
+            if values is None:
+                # Sensors sharing a channel share one read, as in the block.
+                unique, inverse = np.unique(registers, return_inverse=True)
+                values = self._read_channels(
+                    (unique + address + 1).tolist()
+                )[inverse]
+                # The device refuses the block but answers the channels on
+                # their own, so stop sending the block on every poll. A
+                # timeout or other transport error keeps the block.
+                if rejected and count > 1 and not np.isnan(values).all():
+                    failed.append(entry)
+            raw[sensors] = values
+        if failed:
+            self._split_failed_requests(cache, failed)
+
+        # Apply the offset, then scaling and calibration, in place.
+        np.subtract(raw, offsets, out=processed)
+        np.maximum(processed, 0.0, out=processed)
+        processed *= coefficients
+        # tolist() hands the caller its own list; the buffers are reused.
+        sensor_values: List[Optional[float]] = processed.tolist()
+        # Ensure an entry for each sensor
+        for i in np.flatnonzero(np.isnan(raw)):
+            sensor_values[i] = None
+        current_time = time.monotonic() + self._epoch_offset
+        return sensor_values, current_time
+
+    def _read_locked(self) -> Tuple[List[Optional[float]], float]:
+        """
+        Same as _read_unlocked, but holds the sensor mutex for the read.
+        """
+        with self.mutex:
+            return self._read_unlocked()
+
+    # Unlocked by default; __init__ rebinds it when use_mutex is set.
+    get_reading = _read_unlocked
 
     def disconnect(self):
         """
@@ -166,3 +500,58 @@ class Sensor:
         """
         self.modbus_client.close()
         logger.info("Modbus client disconnected.")
+
+
+class SensorBus:
+    """
+    One Modbus client shared by several Sensors.
+
+    Each Sensor made by make_sensor() reads its own subset of channels over
+    the shared client. A common lock is held for a whole poll, so reads from
+    different Sensors never interleave on the bus and each poll still
+    batches its channels into as few requests as possible.
+    """
+
+    def __init__(self, modbus_client: ModbusClient) -> None:
+        """
+        Initialize the bus.
+
+        Args:
+            modbus_client (ModbusClient): The client shared by every Sensor.
+
+        Raises:
+            SensorError: If modbus_client is not provided.
+        """
+        if not modbus_client:
+            raise SensorError("Modbus client is not initialized.")
+        self.modbus_client = modbus_client
+        self.mutex = threading.Lock()
+
+    def make_sensor(
+        self, sensor_config: List[Dict[str, Any]], **kwargs: Any
+    ) -> Sensor:
+        """
+        Create a Sensor for the given channels on the shared client.
+
+        Args:
+            sensor_config (list): The sensor configuration dictionaries.
+            **kwargs: Further Sensor arguments, such as max_gap.
+
+        Returns:
+            Sensor: A Sensor that locks the bus for each reading.
+        """
+        return Sensor(
+            sensor_config,
+            self.modbus_client,
+            use_mutex=True,
+            mutex=self.mutex,
+            **kwargs,
+        )
+
+    def disconnect(self) -> None:
+        """
+        Close the shared Modbus client.
+        """
+        with self.mutex:
+            self.modbus_client.close()
+        logger.info("Modbus client disconnected.")
@@ -2,17 +2,26 @@
 sensor_worker.py - Sensor worker thread for HydroPulse
 
 This module provides the SensorWorker class, a QThread subclass responsible for
-continuously polling a Sensor instance. It emits processed sensor data and
-timestamps via signals and handles any errors encountered during sensor
+continuously polling a Sensor instance. Polls are driven by a QTimer on the
+thread's own event loop. It emits processed sensor data and timestamps in
+batches via signals and handles any errors encountered during sensor
 readings. The module ensures thread safety and orderly shutdown of the
 sensor polling process.
 """
 
-from PyQt5.QtCore import QThread, pyqtSignal, QMutex, QMutexLocker, QObject
-from sensor import Sensor
+from PyQt5.QtCore import (
+    QObject,
+    Qt,
+    QThread,
+    QTimer,
+    pyqtSignal,
+)
+from sensor import ReadCancelled, Sensor, SensorError
 import logging
-from typing import Optional
-from config import POLL_INTERVAL_MS
+import threading
+import time
+from typing import List, Optional
+from config import EMIT_INTERVAL_MS, MAX_BACKOFF_MS, POLL_INTERVAL_MS
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +33,21 @@ class SensorWorker(QThread):
     occur during the sensor reading process.
 
     Attributes:
-        data_ready (pyqtSignal): Emitted with sensor values and a timestamp.
+        data_ready (pyqtSignal): Emitted with a batch of readings: a list of
+        sensor value lists and the matching list of timestamps.
         error_occurred (pyqtSignal): Emitted when an error occurs during
         sensor reading.
     """
-    # Signal to emit sensor data and timestamp
-    data_ready = pyqtSignal(list, float)
-    error_occurred = pyqtSignal(str)  # Fixed signal declaration
+    # Signal to emit batched sensor data and timestamps
+    data_ready = pyqtSignal(list, list)
+    error_occurred = pyqtSignal(str)
 
     def __init__(
         self,
         sensor: Sensor,
         poll_interval: int = POLL_INTERVAL_MS,
-        parent: Optional[QObject] = None,  # Use QObject directly
+        parent: Optional[QObject] = None,
+        emit_interval: int = EMIT_INTERVAL_MS,
     ) -> None:
         """
         Initialize the SensorWorker thread.
@@ -45,47 +56,117 @@ class SensorWorker(QThread):
             sensor (Sensor): The sensor instance to poll.
             poll_interval (int): The interval in ms between sensor polls.
             parent (Optional[QObject]): An optional parent QObject.
+            emit_interval (int): The minimum interval in ms between
+                data_ready emissions; readings in between are batched.
         """
         super().__init__(parent)
         self.sensor = sensor
         self.poll_interval = poll_interval
-        # Mutex to synchronize access to _running flag.
-        self._mutex = QMutex()
-        self._running = False
+        self.emit_interval = emit_interval
+        # Readings collected since the last data_ready emission.
+        self._batch_values: List[list] = []
+        self._batch_timestamps: List[float] = []
+        self._last_emit = 0.0
+        # Consecutive failed polls; each one doubles the poll interval up
+        # to _max_backoff_ms.
+        self._fail_count = 0
+        self._max_backoff_ms = MAX_BACKOFF_MS
+        self._timer: Optional[QTimer] = None
+        # Set while the thread is polling. An Event makes the flag safe to
+        # read and write from any thread without taking a lock.
+        self._running = threading.Event()
 
     def run(self) -> None:
         """
         Main execution loop for the SensorWorker thread.
 
-        This method continuously polls the sensor for readings as long as the
-        thread is running. It emits sensor data via the data_ready signal and
-        errors via the error_occurred signal. The polling interval is
-        maintained by sleeping for the specified number of ms between reads.
+        A precise QTimer on this thread's event loop calls poll() every
+        poll_interval ms, so the cadence does not drift with the time a read
+        takes. The event loop runs until stop() asks it to quit; any batched
+        readings are emitted before the thread ends.
         """
-        """Main execution loop for the thread"""
-        with QMutexLocker(self._mutex):
-            self._running = True
+        self._timer = timer = QTimer()
+        timer.setTimerType(Qt.PreciseTimer)
+        timer.setInterval(self.poll_interval)
+        # This QThread object lives in the creating thread, so call poll()
+        # directly rather than queueing it there.
+        timer.timeout.connect(self.poll, Qt.DirectConnection)
+        self._fail_count = 0
+
+        self._running.set()
+        self.sensor.resume_reads()
 
         logger.info("SensorWorker thread started")
 
+        self._last_emit = time.monotonic()
+        timer.start()
         try:
-            while self.is_running():
-                try:
-                    # Retrieve sensor readings and associated timestamp.
-                    sensor_values, timestamp = self.sensor.get_reading()
-                    # Emit the sensor values and timestamp to connected slots.
-                    self.data_ready.emit(sensor_values, timestamp)
-                except Exception as e:
-                    logger.error("Error in SensorWorker: %s", e)
-                    self.error_occurred.emit(str(e))
-                finally:
-                    # Pause execution for the defined polling interval.
-                    self.msleep(self.poll_interval)
+            self.exec_()
         finally:
-            with QMutexLocker(self._mutex):
-                self._running = False
+            timer.stop()
+            self._timer = None
+            # Hand over any readings still waiting in the batch.
+            self._flush()
+            self._running.clear()
             logger.info("SensorWorker thread stopped")
 
+    def poll(self) -> None:
+        """
+        Read the sensor once and batch the result.
+
+        The batch is emitted via data_ready once the emit interval has
+        elapsed; errors are emitted via error_occurred. After a failure the
+        client must reconnect before the next read, and the poll interval
+        backs off exponentially until a read succeeds.
+        """
+        try:
+            # After a failure, skip the read until the client reconnects.
+            if self._fail_count and not self.sensor.reconnect():
+                raise SensorError("Modbus client is not connected.")
+            # Retrieve sensor readings and associated timestamp.
+            sensor_values, timestamp = self.sensor.get_reading()
+            self._batch_values.append(sensor_values)
+            self._batch_timestamps.append(timestamp)
+            # Emit the batch once the emit interval has elapsed.
+            now = time.monotonic()
+            if (now - self._last_emit) * 1000 >= self.emit_interval:
+                self._flush()
+                self._last_emit = now
+        except ReadCancelled:
+            pass  # stop() abandoned the read; not an error.
+        except Exception as e:
+            logger.error("Error in SensorWorker: %s", e)
+            self.error_occurred.emit(str(e))
+            self._fail_count += 1
+            self._set_interval(
+                min(
+                    self.poll_interval * 2 ** min(self._fail_count, 16),
+                    self._max_backoff_ms,
+                )
+            )
+        else:
+            if self._fail_count:
+                self._fail_count = 0
+                self._set_interval(self.poll_interval)
+
+    def _set_interval(self, interval: int) -> None:
+        """
+        Change the poll timer's interval if the timer is running.
+        """
+        if self._timer is not None:
+            self._timer.setInterval(interval)
+
+    def _flush(self) -> None:
+        """
+        Emit the batched readings via data_ready and start a new batch.
+        """
+        if not self._batch_timestamps:
+            return
+        values, timestamps = self._batch_values, self._batch_timestamps
+        self._batch_values = []
+        self._batch_timestamps = []
+        self.data_ready.emit(values, timestamps)
+
     def is_running(self):
         """
         Check whether the SensorWorker thread is currently running in a
@@ -94,28 +175,28 @@ class SensorWorker(QThread):
         Returns:
             bool: True if the thread is set to run; False otherwise.
         """
-        """Thread-safe running check"""
-        with QMutexLocker(self._mutex):
-            return self._running
+        return self._running.is_set()
 
     def stop(self):
         """
         Stop the SensorWorker thread in an orderly fashion.
 
-        This method sets the running flag to False, signals the thread to quit,
-        and waits for up to 2 seconds for a graceful shutdown. If the thread
-        does not terminate in time, it forces termination.
+        This method sets the running flag to False, signals the thread's event
+        loop to quit, and waits for up to 2 seconds for a graceful shutdown.
+        If the thread does not terminate in time, it forces termination.
         """
-        """Orderly thread shutdown"""
         logger.debug("Stopping SensorWorker...")
 
-        with QMutexLocker(self._mutex):
-            self._running = False
+        self._running.clear()
+        # Cut short a read that is waiting out a retry backoff.
+        self.sensor.cancel_reads()
 
         # Signal the thread to stop and attempt graceful shutdown.
         self.quit()
         if not self.wait(2000):  # 2 second timeout
             logger.warning("Forcing thread termination")
             self.terminate()
+            self.wait()
+            self._timer = None
 
         logger.info("SensorWorker stopped confirmed")
@@ -0,0 +1,136 @@
+"""
+session_store.py
+
+This module provides SessionStore, which keeps every reading of a session
+in preallocated NumPy blocks rather than in deques of Python floats, so the
+full session costs 8 bytes per value. Full blocks are written out to a
+temporary file as the session goes on, so memory use stays bounded by one
+block however long the session runs.
+"""
+
+import tempfile
+from typing import IO, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import SESSION_BLOCK_SIZE
+
+
+class SessionStore:
+    """
+    Append-only store of timestamped readings for a set of channels.
+
+    Readings are written into a block of block_size rows. Once the block is
+    full it is appended to a temporary file and the next readings go into a
+    fresh block. Missing readings (None) are stored as NaN.
+
+    Attributes:
+        channels: The number of channels stored per reading.
+    """
+
+    __slots__ = (
+        "channels",
+        "_block_size",
+        "_block",
+        "_ts_block",
+        "_pos",
+        "_spill",
+        "_spilled",
+    )
+
+    def __init__(
+        self, channels: int, block_size: int = SESSION_BLOCK_SIZE
+    ) -> None:
+        """
+        Create an empty store.
+
+        Args:
+            channels: The number of channels stored per reading.
+            block_size: The number of readings per block.
+        """
+        self.channels = channels
+        self._block_size = block_size
+        self._block = np.empty((channels, block_size))
+        self._ts_block = np.empty(block_size)
+        # Next free row in the current block.
+        self._pos = 0
+        # Temporary file holding the full blocks, created on first use.
+        self._spill: Optional[IO[bytes]] = None
+        # For each spilled block: [channels written, channels still valid].
+        # Channels removed since are dropped when the blocks are read back.
+        self._spilled: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return len(self._spilled) * self._block_size + self._pos
+
+    def append(
+        self, values: Sequence[Optional[float]], timestamp: float
+    ) -> None:
+        """
+        Store one reading. Channels missing from values are stored as NaN;
+        extra values are ignored.
+        """
+        if self._pos == self._block_size:
+            self._spill_block()
+        values = values[: self.channels]
+        column = self._block[:, self._pos]
+        # NumPy stores None as NaN.
+        column[: len(values)] = values
+        column[len(values):] = np.nan
+        self._ts_block[self._pos] = timestamp
+        self._pos += 1
+
+    def add_channel(self) -> None:
+        """
+        Add a channel; earlier readings have NaN for it.
+        """
+        nan_row = np.full((1, self._block_size), np.nan)
+        self._block = np.concatenate((self._block, nan_row))
+        self.channels += 1
+
+    def remove_channel(self) -> None:
+        """
+        Drop the last channel and its readings.
+        """
+        if self.channels:
+            self.channels -= 1
+            self._block = self._block[:-1].copy()
+            for counts in self._spilled:
+                counts[1] = min(counts[1], self.channels)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the whole session back into contiguous arrays.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The timestamps, shape (n,), and
+            the readings, shape (channels, n).
+        """
+        size = self._block_size
+        total = len(self)
+        timestamps = np.empty(total)
+        data = np.full((self.channels, total), np.nan)
+        if self._spill is not None:
+            self._spill.seek(0)
+            for k, (written, valid) in enumerate(self._spilled):
+                cols = slice(k * size, (k + 1) * size)
+                self._spill.readinto(timestamps[cols])
+                block = np.empty((written, size))
+                self._spill.readinto(block)
+                data[:valid, cols] = block[:valid]
+            self._spill.seek(0, 2)
+        cols = slice(total - self._pos, total)
+        timestamps[cols] = self._ts_block[: self._pos]
+        data[:, cols] = self._block[:, : self._pos]
+        return timestamps, data
+
+    def _spill_block(self) -> None:
+        """
+        Append the full current block to the temporary file.
+        """
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile()
+        self._spill.write(self._ts_block)
+        self._spill.write(self._block)
+        self._spilled.append([self.channels, self.channels])
+        self._pos = 0
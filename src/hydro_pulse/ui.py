@@ -13,9 +13,14 @@ Usage:
 
 # Standard library imports
 import os
-from collections import deque
+import sys
 from datetime import datetime
+from functools import lru_cache
 import logging
+from typing import Optional
+
+if sys.platform == "win32":
+    from ctypes.wintypes import MSG
 
 # Third-party imports
 import numpy as np
@@ -35,13 +40,17 @@ from sensor import Sensor, SensorError
 from dialog import ConfigDialog
 from sensor_worker import SensorWorker
 from config import (
+    load_save_format,
     load_sensor_config,
+    make_buffer,
     sensor_config,
     Y_AXIS_MAX,
     TIME_WINDOW_SEC,
-    MAX_POINTS,
     POLL_INTERVAL_MS,
+    PLOT_REFRESH_MS,
 )
+from rolling_stats import RollingStats
+from session_store import SessionStore
 from save_tasks import SaveTask
 import resources_rc  # noqa: F401
 
@@ -50,6 +59,67 @@ import resources_rc  # noqa: F401
 logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
 logger = logging.getLogger(__name__)
 
+# Windows device-change notification codes (winuser.h, dbt.h).
+WM_DEVICECHANGE = 0x0219
+DBT_DEVICEARRIVAL = 0x8000
+DBT_DEVICEREMOVECOMPLETE = 0x8004
+
+# Status line states, mapped to (dot color, message). Error states stay
+# shown until a non-error update is allowed and disable auto-reset.
+_STATUS = {
+    "Ready": ("green", "Ready"),
+    "Connecting": ("orange", "Connecting..."),
+    "Connected": ("green", "Connected to Modbus"),
+    "Failed": ("red", "Failed to connect to Modbus"),
+    "Disconnected": ("red", "Connection stopped"),
+    "FileSaved": ("green", "File saved successfully"),
+    "FullFileSaved": ("green", "Full File saved successfully"),
+}
+_ERROR_STATUS = {
+    "Failed": ("red", "Failed to connect to Modbus"),
+    "FileSaveError": ("red", "File save error"),
+    "FullFileSaveError": ("red", "Full file save error"),
+    "Worker Error": ("red", "Worker error"),
+}
+# States that revert to "Ready" after the reset delay.
+_AUTO_RESET_STATES = frozenset(
+    {"Connecting", "Disconnected", "FileSaved", "FullFileSaved"}
+)
+
+# Writers for saved data, by file format (see config.SAVE_FORMATS).
+_DATA_FRAME_WRITERS = {
+    "parquet": lambda df, path: df.to_parquet(
+        path, index=False, compression="snappy"
+    ),
+    "csv": lambda df, path: df.to_csv(path, index=False),
+    "xlsx": lambda df, path: df.to_excel(path, index=False),
+}
+
+# Axis ticks, built once and reused whenever the axes are set up.
+_Y_TICKS = np.arange(0, Y_AXIS_MAX + 1, 50)
+_X_TICKS = np.arange(0, TIME_WINDOW_SEC + 1, 30)
+
+
+@lru_cache(maxsize=86400)
+def _format_time(second: int) -> str:
+    """
+    Format a Unix time in whole seconds as local "HH:MM:SS".
+
+    Readings arrive several times a second, so saved timestamps repeat the
+    same second and most lookups hit the cache.
+    """
+    return datetime.fromtimestamp(second).strftime("%H:%M:%S")
+
+
+def format_timestamps(timestamps: np.ndarray) -> list:
+    """
+    Format an array of Unix timestamps as local "HH:MM:SS" strings.
+    """
+    return [
+        _format_time(second)
+        for second in np.floor(timestamps).astype(np.int64).tolist()
+    ]
+
 
 # -------- Matplotlib Canvas for PyQt --------
 class MplCanvas(FigureCanvas):
@@ -92,29 +162,34 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.sensor_config = load_sensor_config(sensor_config)
 
         # For rolling window data, limit to MAX_POINTS entries
-        self.sensor_data = [
-            deque(maxlen=MAX_POINTS)
-            for _ in self.sensor_config
-        ]
-        self.timestamps = deque(maxlen=MAX_POINTS)
+        self.sensor_data = [make_buffer() for _ in self.sensor_config]
+        self.timestamps = make_buffer()
 
-        # For full session data, you may or may not limit; here we don't
-        self.full_sensor_data = [deque() for _ in self.sensor_config]
-        self.full_timestamps = deque()
+        # Full session data is kept unbounded, in NumPy blocks.
+        self.full_session = SessionStore(len(self.sensor_config))
+        # Running statistics per sensor_data buffer; see window_stats().
+        self._window_stats = []
 
         # Create a layout placeholder (if needed for further use)
         self.sensor_layout = QtWidgets.QVBoxLayout()
 
-        # Create and set up the custom status label
+        # Create and set up the custom status line: a colored dot and a
+        # plain-text message, updated via palette and setText rather than
+        # by re-parsing rich text.
+        self.status_dot = QtWidgets.QLabel("\u25cf")
+        self.status_dot.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+        # A font, not a style sheet, so the palette color is honored.
+        dot_font = self.status_dot.font()
+        dot_font.setPixelSize(16)
+        self.status_dot.setFont(dot_font)
         self.status_label = QtWidgets.QLabel()
-        self.status_label.setTextFormat(QtCore.Qt.TextFormat.RichText)
-        self.status_label.setText(
-            "<span style='color: green; font-size: 16px;'>&#9679;</span> "
-            "<span style='color: black; font-size: 16px;'>Ready</span>"
-        )
+        self.status_label.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+        self.status_label.setStyleSheet("color: black; font-size: 16px;")
         self.status_label.setSizePolicy(
             QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred
         )
+        self._status_shown = None
+        self.show_status("green", "Ready")
 
         # Initialize modbus client and sensor data storage
         self.modbus_client = None
@@ -123,6 +198,19 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.sensor_timer = None  # New: QTimer for periodic readings
 
         self.last_mouse_event = None
+        # Axes without the sensor lines, saved after each full draw so new
+        # data can be blitted on top of it.
+        self._plot_background = None
+        # Coalesces mouse moves for update_cursor_annotations.
+        self._motion_timer = QtCore.QTimer(self)
+        self._motion_timer.setSingleShot(True)
+        self._motion_timer.setInterval(50)
+        self._motion_timer.timeout.connect(self.update_cursor_annotations)
+        # Coalesces plot updates; see schedule_plot_update().
+        self._plot_update_timer = QtCore.QTimer(self)
+        self._plot_update_timer.setSingleShot(True)
+        self._plot_update_timer.setInterval(PLOT_REFRESH_MS)
+        self._plot_update_timer.timeout.connect(self.update_plot_ui)
 
         # Build the UI
         self.initUI()
@@ -140,8 +228,8 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.canvas.ax.set_xlim(0, TIME_WINDOW_SEC)
         # Enable grid and set ticks.
         self.canvas.ax.grid(True)
-        self.canvas.ax.set_yticks(np.arange(0, Y_AXIS_MAX + 1, 50))
-        self.canvas.ax.set_xticks(np.arange(0, TIME_WINDOW_SEC + 1, 30))
+        self.canvas.ax.set_yticks(_Y_TICKS)
+        self.canvas.ax.set_xticks(_X_TICKS)
 
     def initialize_plot_lines(self) -> None:
         """Initialize plot lines for each sensor and add a legend."""
@@ -149,6 +237,8 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.scatter_plots = []  # Create a list to hold scatter objects.
         for sensor in self.sensor_config:
             # Use sensor.get("style", "-") in case the style key is missing.
+            # Animated lines are left out of full draws and blitted
+            # separately (see on_plot_draw and blit_plot_lines).
             (line,) = self.canvas.ax.plot(
                 [],
                 [],
@@ -156,6 +246,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
                 color=sensor["color"],
                 linestyle=sensor.get("style", "-"),
                 linewidth=2,
+                animated=True,
             )
             line.set_picker(5)  # Set a 5-pixel picking tolerance.
             self.lines.append(line)
@@ -172,6 +263,40 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.canvas.ax.legend(loc="upper left")
         self.canvas.draw()
 
+    def update_line_styles(self) -> None:
+        """
+        Empty the existing plot lines and apply the current sensor styles.
+
+        Used instead of initialize_plot_lines when the number of sensors is
+        unchanged, so the artists (and the cursor hooked to them) are kept.
+        If a name, color or style changed, the legend entries are updated in
+        place rather than by building a new legend.
+        """
+        legend_changed = False
+        for line, scatter, sensor in zip(
+            self.lines, self.scatter_plots, self.sensor_config
+        ):
+            line.set_data([], [])
+            before = (line.get_label(), line.get_color(), line.get_linestyle())
+            line.set_label(sensor["name"])
+            line.set_color(sensor["color"])
+            line.set_linestyle(sensor.get("style", "-"))
+            scatter.set_color(sensor["color"])
+            after = (line.get_label(), line.get_color(), line.get_linestyle())
+            legend_changed = legend_changed or before != after
+        if not legend_changed:
+            return
+        legend = self.canvas.ax.get_legend()
+        if legend is None or len(legend.texts) != len(self.lines):
+            self.canvas.ax.legend(loc="upper left")
+            return
+        for text, handle, line in zip(
+            legend.texts, legend.legend_handles, self.lines
+        ):
+            text.set_text(line.get_label())
+            handle.set_color(line.get_color())
+            handle.set_linestyle(line.get_linestyle())
+
     def initUI(self) -> None:
         """
         Set up the main UI elements including toolbar, plot area, stats panel,
@@ -229,9 +354,10 @@ class SensorPlotter(QtWidgets.QMainWindow):
         center_layout = QtWidgets.QHBoxLayout()
         self.com_port_combo = QtWidgets.QComboBox()
         ports = list(serial.tools.list_ports.comports())
+        # Port names last shown in the combo box; see update_com_ports.
+        self._known_ports = tuple(port.device for port in ports)
         if ports:
-            for port in ports:
-                self.com_port_combo.addItem(port.device)
+            self.com_port_combo.addItems(self._known_ports)
             self.com_port_combo.setCurrentIndex(0)
             self.start_button.setEnabled(True)
         else:
@@ -245,7 +371,15 @@ class SensorPlotter(QtWidgets.QMainWindow):
         # Timer to update COM port list.
         self.com_port_timer = QtCore.QTimer(self)
         self.com_port_timer.timeout.connect(self.update_com_ports)
-        self.com_port_timer.start(5000)  # Check every 5 seconds.
+        if sys.platform == "win32":
+            # Rescan only when Windows reports a device being plugged in or
+            # removed (see nativeEvent); the delay coalesces bursts.
+            self.com_port_timer.setSingleShot(True)
+            self.com_port_timer.setInterval(200)
+        else:
+            # Other platforms get no device-change event here, so keep
+            # polling for ports.
+            self.com_port_timer.start(5000)  # Check every 5 seconds.
 
         self.baud_rate_combo = QtWidgets.QComboBox()
         baud_rates = [
@@ -318,6 +452,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
         main_area.addWidget(scroll_area, 1)
 
         # Set up the plot axes and initialize plot lines.
+        self.canvas.mpl_connect("draw_event", self.on_plot_draw)
         self.setup_plot_axes()
         self.initialize_plot_lines()
 
@@ -335,6 +470,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
             QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
         )
         # Add label to status layout and a stretch so it takes one line.
+        status_layout.addWidget(self.status_dot)
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
         # Add the status layout at the bottom of the main layout
@@ -342,9 +478,10 @@ class SensorPlotter(QtWidgets.QMainWindow):
         # Initialize the status line as "Ready"
         self.update_status_line_with_default("Ready")
 
-        # Set button styles
+        # Set button styles. One style sheet on the central widget, matched
+        # by object name, is polished once instead of once per button.
         button_style = """
-        QPushButton {
+        QPushButton#toolButton {
             background-color: #0078D7;
             color: white;
             border: none;
@@ -352,54 +489,77 @@ class SensorPlotter(QtWidgets.QMainWindow):
             border-radius: 4px;
             font: 10pt "Segoe UI";
         }
-        QPushButton:hover {
+        QPushButton#toolButton:hover {
             background-color: #005A9E;
         }
-        QPushButton:pressed {
+        QPushButton#toolButton:pressed {
             background-color: #004578;
         }
-        QPushButton:disabled {
+        QPushButton#toolButton:disabled {
             background-color: #A0A0A0;
             color: #808080;
         }
         """
-        self.start_button.setStyleSheet(button_style)
-        self.stop_button.setStyleSheet(button_style)
-        self.config_button.setStyleSheet(button_style)
+        for button in (
+            self.start_button, self.stop_button, self.config_button
+        ):
+            button.setObjectName("toolButton")
+        central_widget.setStyleSheet(button_style)
 
         logger.info("UI Initialized")
 
+    def nativeEvent(self, eventType, message):
+        """
+        Schedule a COM port rescan when a device is added or removed.
+
+        Windows broadcasts WM_DEVICECHANGE to all top-level windows when a
+        serial port appears or disappears.
+        """
+        if eventType == b"windows_generic_MSG" and self.com_port_timer:
+            msg = MSG.from_address(int(message))
+            if msg.message == WM_DEVICECHANGE and msg.wParam in (
+                DBT_DEVICEARRIVAL,
+                DBT_DEVICEREMOVECOMPLETE,
+            ):
+                self.com_port_timer.start()
+        return super().nativeEvent(eventType, message)
+
     def update_com_ports(self) -> None:
         """
         Automatically update the COM port combo box by rechecking available
         ports. If no COM ports are available, the combo box will be cleared
-        and the Start button disabled.
+        and the Start button disabled. The selected port is kept if it is
+        still available.
         """
         import serial.tools.list_ports
 
-        ports = list(serial.tools.list_ports.comports())
-        port_names = [port.device for port in ports]
-
-        # Get the current items in the combo box.
-        current_items = [
-            self.com_port_combo.itemText(i)
-            for i in range(self.com_port_combo.count())
-        ]
+        port_names = tuple(
+            port.device for port in serial.tools.list_ports.comports()
+        )
 
         # Only update if there is a change.
-        if port_names != current_items:
+        if port_names == self._known_ports:
+            return
+        self._known_ports = port_names
+        selected = self.com_port_combo.currentText()
+        # Rebuild the items without emitting a signal for each change.
+        with QtCore.QSignalBlocker(self.com_port_combo):
             self.com_port_combo.clear()
-            if port_names:
-                self.com_port_combo.addItems(port_names)
-                self.com_port_combo.setCurrentIndex(0)
-                self.start_button.setEnabled(True)
-            else:
-                # No ports: the combo box empty and disable Start.
-                self.start_button.setEnabled(False)
+            self.com_port_combo.addItems(port_names)
+        if port_names:
+            index = self.com_port_combo.findText(selected)
+            self.com_port_combo.setCurrentIndex(max(index, 0))
+            self.start_button.setEnabled(True)
+        else:
+            # No ports: the combo box empty and disable Start.
+            self.start_button.setEnabled(False)
 
     def init_statistics_panel(self):
         """Initializes the statistics panel widgets once."""
         self.sensor_stats_labels = {}
+        # Each sensor's value labels by sensor index, so update_plot_ui needs
+        # no lookup by name.
+        self._stats_labels_by_idx = []
         # Clear any existing layout widgets, if needed.
         for i in reversed(range(self.stats_layout.count())):
             widget = self.stats_layout.itemAt(i).widget()
@@ -449,12 +609,14 @@ class SensorPlotter(QtWidgets.QMainWindow):
             grid.addWidget(avg_value, 4, 1)
 
             self.stats_layout.addWidget(sensor_widget)
-            self.sensor_stats_labels[sensor["name"]] = {
+            labels = {
                 "current": current_value,
                 "min": min_value,
                 "max": max_value,
                 "avg": avg_value,
             }
+            self.sensor_stats_labels[sensor["name"]] = labels
+            self._stats_labels_by_idx.append(labels)
 
         logger.info("Statistics panel initialized")
 
@@ -467,39 +629,97 @@ class SensorPlotter(QtWidgets.QMainWindow):
             self.init_statistics_panel()
 
         # Update the values for each sensor.
-        for idx, sensor in enumerate(self.sensor_config):
-            labels = self.sensor_stats_labels.get(sensor["name"])
-            if labels:
-                data = list(self.sensor_data[idx])
-                if data:
-                    current_val = data[-1]
-                    non_null_data = [d for d in data if d is not None]
-                    min_val = min(non_null_data) if non_null_data else None
-                    max_val = max(non_null_data) if non_null_data else None
-                    avg_val = (
-                        (sum(non_null_data) / len(non_null_data))
-                        if non_null_data
-                        else None
-                    )
-
-                    labels["current"].setText(f"{current_val:.2f}")
-                    labels["min"].setText(
-                        f"{min_val:.2f}" if min_val is not None else ""
-                    )
-                    labels["max"].setText(
-                        f"{max_val:.2f}" if max_val is not None else ""
-                    )
-                    labels["avg"].setText(
-                        f"{avg_val:.2f}" if avg_val is not None else ""
-                    )
-                else:
-                    labels["current"].setText("")
-                    labels["min"].setText("")
-                    labels["max"].setText("")
-                    labels["avg"].setText("")
+        labels_by_idx = self._stats_labels_by_idx
+        for idx in range(min(len(labels_by_idx), len(self.sensor_data))):
+            self.update_stats_labels(
+                labels_by_idx[idx],
+                self.sensor_data[idx],
+                self.window_stats(idx),
+            )
         # Optionally, log that the panel was updated.
         logger.info("Statistics panel refreshed")
 
+    def window_stats(self, idx: int) -> RollingStats:
+        """
+        Return the running statistics of sensor idx's rolling window.
+
+        They are rebuilt from sensor_data[idx] if that buffer was replaced
+        or changed other than through these statistics.
+        """
+        buffer = self.sensor_data[idx]
+        all_stats = self._window_stats
+        if idx >= len(all_stats):
+            all_stats.extend([None] * (idx + 1 - len(all_stats)))
+        stats = all_stats[idx]
+        if stats is None or not stats.in_sync(buffer):
+            stats = all_stats[idx] = RollingStats(buffer)
+        return stats
+
+    @staticmethod
+    def update_stats_labels(
+        labels: dict,
+        data,
+        stats: Optional[RollingStats] = None,
+    ) -> None:
+        """
+        Show the current, min, max and average of one sensor's readings.
+
+        With running statistics for data, the values are read in O(1).
+        Otherwise the readings are converted to a NumPy array (unless they
+        already are one), with missing values (None) as NaN, and reduced
+        in C.
+
+        Args:
+            labels (dict): The sensor's "current", "min", "max" and "avg"
+                labels.
+            data: The sensor's readings, oldest first.
+            stats (RollingStats): Opt; running statistics of data.
+        """
+        if stats is not None:
+            values = (
+                stats.current(), stats.minimum(), stats.maximum(), stats.mean()
+            )
+        else:
+            array = np.asarray(data, dtype=np.float64)
+            valid = array[~np.isnan(array)]
+            if valid.size:
+                values = (
+                    array[-1], valid.min(), valid.max(), valid.mean()
+                )
+            else:
+                values = (None,) * 4
+        for key, value in zip(("current", "min", "max", "avg"), values):
+            text = "" if value is None or value != value else f"{value:.2f}"
+            labels[key].setText(text)
+
+    def on_plot_draw(self, event) -> None:
+        """
+        Save the freshly drawn background and draw the sensor lines on it.
+
+        Called by Matplotlib after every full draw, including resizes.
+        """
+        self._plot_background = self.canvas.copy_from_bbox(
+            self.canvas.ax.bbox
+        )
+        for line in self.lines:
+            self.canvas.ax.draw_artist(line)
+
+    def blit_plot_lines(self) -> None:
+        """
+        Redraw only the sensor lines over the saved background.
+
+        Falls back to a full draw when there is no background yet or when
+        anything else on the figure (legend, colors, axes) has changed.
+        Updating an animated line's data does not mark the figure stale.
+        """
+        if self._plot_background is None or self.canvas.figure.stale:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._plot_background)
+        for line in self.lines:
+            self.canvas.ax.draw_artist(line)
+        self.canvas.blit(self.canvas.ax.bbox)
+
     def add_cursor(self) -> None:
         """
         Enable interactive cursor functionality for the plot.
@@ -521,31 +741,44 @@ class SensorPlotter(QtWidgets.QMainWindow):
             sel.annotation.set_visible(True)
 
     def on_motion_notify(self, event: QtCore.QEvent) -> None:
+        """
+        Remember the mouse position and schedule an annotation update.
+
+        Mouse moves arrive far faster than the plot can be redrawn, so they
+        are coalesced: update_cursor_annotations runs at most once per
+        _motion_timer interval, using the latest event.
+        """
         self.last_mouse_event = event
+        cursor = getattr(self, "cursor", None)
+        if (
+            cursor is not None
+            and cursor.selections
+            and not self._motion_timer.isActive()
+        ):
+            self._motion_timer.start()
 
-        # Check for active selections
-        if hasattr(self, "cursor") and self.cursor is not None:
-            for sel in self.cursor.selections:
-                # Get data coordinates for the target point.
-                data_coords = sel.target  # (x, y) in data coordinates
-                # Transform them to display (pixel) coordinates.
-                display_coords = self.canvas.ax.transData.transform(
-                    data_coords
-                )
-                # Use current event coordinates.
-                event_coords = (event.x, event.y)
-                # Calculate Euclidean distance in pixels.
-                distance = (
-                    (display_coords[0] - event_coords[0]) ** 2
-                    + (display_coords[1] - event_coords[1]) ** 2
-                ) ** 0.5
-                threshold = 10  # Adjust this threshold as needed.
-                # Show annotation if within threshold, hide otherwise.
-                if distance > threshold:
-                    sel.annotation.set_visible(False)
-                else:
-                    sel.annotation.set_visible(True)
-            # Force a redraw to update annotation visibility.
+    def update_cursor_annotations(self) -> None:
+        """
+        Show only the cursor annotations near the last mouse position.
+
+        The plot is redrawn only if an annotation's visibility changed.
+        """
+        event = self.last_mouse_event
+        cursor = getattr(self, "cursor", None)
+        if event is None or cursor is None or not cursor.selections:
+            return
+        changed = False
+        threshold = 10  # Pixels; adjust as needed.
+        for sel in cursor.selections:
+            # Transform the target's data coordinates to display (pixel)
+            # coordinates and compare with the event position.
+            x, y = self.canvas.ax.transData.transform(sel.target)
+            distance = ((x - event.x) ** 2 + (y - event.y) ** 2) ** 0.5
+            visible = distance <= threshold
+            if sel.annotation.get_visible() != visible:
+                sel.annotation.set_visible(visible)
+                changed = True
+        if changed:
             self.canvas.draw_idle()
 
     def open_config_dialog(self) -> None:
@@ -556,6 +789,20 @@ class SensorPlotter(QtWidgets.QMainWindow):
         dialog.setModal(True)  # Ensure the dialog is non-modal.
         dialog.show()
 
+    def show_status(self, color: str, message: str) -> None:
+        """
+        Show a message in the status line next to a dot of the given color.
+
+        Does nothing if the same status is already shown.
+        """
+        if self._status_shown == (color, message):
+            return
+        self._status_shown = (color, message)
+        palette = self.status_dot.palette()
+        palette.setColor(QtGui.QPalette.WindowText, QtGui.QColor(color))
+        self.status_dot.setPalette(palette)
+        self.status_label.setText(message)
+
     def update_status_line_with_default(
         self, state: str, reset_after: int = 3000
     ) -> None:
@@ -574,83 +821,35 @@ class SensorPlotter(QtWidgets.QMainWindow):
             )
             return
 
-        # Define error states.
-        error_states = {
-            "Failed",
-            "FileSaveError",
-            "FullFileSaveError",
-            "Worker Error"}
-
+        error_active = getattr(self, "_error_state_active", False)
         # If an error is already, ignore update.
-        if (getattr(self, "_error_state_active", False)
-                and state not in error_states):
+        if error_active and state not in _ERROR_STATUS:
             logger.info("Error state active; ignoring update to %s", state)
             return
 
         # If the new state is an error...
-        if state in error_states:
+        if state in _ERROR_STATUS:
             # If an error is already active, do not override it.
-            if getattr(self, "_error_state_active", False):
+            if error_active:
                 logger.info(
                     "Error state already active; ignoring update to %s",
                     state
                 )
                 return
-            else:
-                self._error_state_active = True
-                logger.info(
-                    "Error state '%s' displayed; auto-reset disabled.",
-                    state
-                )
-                # Use a mapping with unique keys.
-                error_map = {
-                    "Failed": ("red", "Failed to connect to Modbus"),
-                    "FileSaveError": ("red", "File save error"),
-                    "FullFileSaveError": ("red", "Full file save error"),
-                    "Worker Error": ("red", "Worker error"),
-                }
-                color, message = error_map.get(state, ("black", state))
-                html_text = (
-                    f"<span style='color: {color}; font-size: 16px;'>"
-                    f"&#9679;</span> "
-                    f"<span style='color: black; font-size: 16px;'>"
-                    f"{message}</span>"
-                )
-                self.status_label.setText(html_text)
-                return
-        else:
-            # Clear error state for normal updates.
-            self._error_state_active = False
-
-        # Define text and color mapping for each state.
-        state_map = {
-            "Ready": ("green", "Ready"),
-            "Connecting": ("orange", "Connecting..."),
-            "Connected": ("green", "Connected to Modbus"),
-            "Failed": ("red", "Failed to connect to Modbus"),
-            "Disconnected": ("red", "Connection stopped"),
-            "FileSaved": ("green", "File saved successfully"),
-            "FullFileSaved": ("green", "Full File saved successfully"),
-        }
+            self._error_state_active = True
+            logger.info(
+                "Error state '%s' displayed; auto-reset disabled.", state
+            )
+            self.show_status(*_ERROR_STATUS[state])
+            return
+        # Clear error state for normal updates.
+        self._error_state_active = False
+
         # Get color and message; default to black if state not defined.
-        color, message = state_map.get(state, ("black", state))
-        html_text = (
-            f"<span style='color: {color}; font-size: 16px;'>&#9679;</span> "
-            f"<span style='color: black; font-size: 16px;'>{message}</span>"
-        )
-        self.status_label.setText(html_text)
-
-        # Schedule auto-reset if applicable.
-        delay_mapping = {
-            "Connecting": reset_after,
-            "Disconnected": reset_after,
-            "FileSaved": reset_after,
-            "FullFileSaved": reset_after,
-        }
+        self.show_status(*_STATUS.get(state, ("black", state)))
 
         # If this state requires auto-reset.
-        if state in delay_mapping:
-            delay = delay_mapping[state]
+        if state in _AUTO_RESET_STATES:
             # Create the timer once if it doesn't exist.
             if not hasattr(self, "_auto_reset_timer"):
                 self._auto_reset_timer = QtCore.QTimer(self)
@@ -662,7 +861,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
             # If the timer is active, stop it before starting a new one.
             if self._auto_reset_timer.isActive():
                 self._auto_reset_timer.stop()
-            self._auto_reset_timer.start(delay)
+            self._auto_reset_timer.start(reset_after)
 
     def read_sensor_data(self) -> None:
         """
@@ -674,58 +873,47 @@ class SensorPlotter(QtWidgets.QMainWindow):
             return
         try:
             sensor_values, current_time = self.sensor.get_reading()
-            self.handle_new_data(sensor_values, current_time)
+            self.append_reading(sensor_values, current_time)
+            self.schedule_plot_update()
         except SensorError as e:
             logger.error("Error reading sensor data: %s", e)
             # Optionally, update the status line with an error state.
             self.update_status_line_with_default("Failed")
 
-    @staticmethod
-    def pad_dict_list(dict_list, pad_value=0):
-        """
-        Pad lists in a dictionary so that all lists have the same length.
-
-        Args:
-            dict_list (dict): Dictionary whose values are lists.
-            pad_value: Value to pad shorter lists with (default is 0).
-
-        Returns:
-            dict: The dictionary with padded lists.
-        """
-        max_length = max(len(lst) for lst in dict_list.values())
-        for key, lst in dict_list.items():
-            if len(lst) < max_length:
-                dict_list[key] += [pad_value] * (max_length - len(lst))
-        return dict_list
-
     def reinitialize_plot_lines(self) -> None:
         """
         Reinitialize the plot lines and refresh the statistics panel.
 
         This clears the current plot, resets data arrays for the current
-        window, and redraws the plot lines.
+        window, and redraws the plot lines. If the number of sensors is
+        unchanged, the existing lines are emptied and restyled rather than
+        rebuilt.
         """
         logger.info("Starting reinitialization of plot lines...")
 
-        # Set up the static plot axes (titles, labels, grid, etc.)
-        self.setup_plot_axes()
+        # Force a full draw on the next update.
+        self._plot_background = None
+        rebuild = len(self.lines) != len(self.sensor_config)
+        if rebuild:
+            # Set up the static plot axes (titles, labels, grid, etc.)
+            self.setup_plot_axes()
 
         # Reinitialize data arrays as deques to maintain the rolling window
-        self.sensor_data = [
-            deque(maxlen=MAX_POINTS)
-            for _ in self.sensor_config
-        ]
-        self.timestamps = deque(maxlen=MAX_POINTS)
+        self.sensor_data = [make_buffer() for _ in self.sensor_config]
+        self.timestamps = make_buffer()
 
         # Reinitialize full session data as well
-        self.full_sensor_data = [deque() for _ in self.sensor_config]
-        self.full_timestamps = deque()
+        self.full_session = SessionStore(len(self.sensor_config))
 
-        # Initialize the plot lines for each sensor.
-        self.initialize_plot_lines()
+        if rebuild:
+            # Initialize the plot lines for each sensor.
+            self.initialize_plot_lines()
 
-        # Reattach interactive cursor functionality.
-        self.add_cursor()
+            # Reattach interactive cursor functionality.
+            self.add_cursor()
+        else:
+            self.update_line_styles()
+            self.canvas.draw()
 
         # Refresh the statistics panel.
         self.refresh_statistics_panel()
@@ -802,7 +990,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
                     POLL_INTERVAL_MS,
                     self
                 )
-                self.sensor_worker.data_ready.connect(self.handle_new_data)
+                self.sensor_worker.data_ready.connect(self.handle_new_batch)
                 self.sensor_worker.error_occurred.connect(
                     self.handle_worker_error
                 )  # Connect the error signal
@@ -827,6 +1015,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
         if hasattr(self, "sensor_worker") and self.sensor_worker:
             self.sensor_worker.stop()
             self.sensor_worker = None
+            self.deliver_pending_batches()
 
         # Optionally disconnect sensor if needed.
         if self.sensor:
@@ -835,11 +1024,9 @@ class SensorPlotter(QtWidgets.QMainWindow):
 
         # Existing code for saving data and closing the modbus client.
         if self.modbus_client:
-            # Use QThreadPool to run the save tasks
-            QThreadPool.globalInstance().start(SaveTask(self.save_data))
-            QThreadPool.globalInstance().start(
-                SaveTask(self.save_full_session_data)
-            )
+            # Save both files in one background task, one after the other,
+            # so they do not compete for the disk or the GIL.
+            QThreadPool.globalInstance().start(SaveTask(self.save_all_data))
             try:
                 self.modbus_client.close()
             except Exception:
@@ -850,32 +1037,77 @@ class SensorPlotter(QtWidgets.QMainWindow):
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
 
+    def deliver_pending_batches(self) -> None:
+        """
+        Handle batches a stopped worker emitted that are still queued.
+
+        The worker emits its last batch as it stops, from its own thread,
+        so the batch waits in this thread's event queue. Delivering it now
+        lets a save started right after stopping include those readings.
+        Only queued calls to this window's slots, such as handle_new_batch,
+        are delivered, in the order they were emitted; other objects' events
+        wait for the event loop.
+        """
+        QtCore.QCoreApplication.sendPostedEvents(self, QtCore.QEvent.MetaCall)
+
+    @QtCore.pyqtSlot(list, list)
+    def handle_new_batch(
+        self, values_batch: list, timestamps: list
+    ) -> None:
+        """
+        Handle a batch of sensor readings emitted by the SensorWorker thread.
+
+        Appends every reading in the batch, then schedules one plot update.
+        Batches arriving within the same frame share that update.
+        """
+        for sensor_values, current_time in zip(values_batch, timestamps):
+            self.append_reading(sensor_values, current_time)
+        self.schedule_plot_update()
+
+    def schedule_plot_update(self) -> None:
+        """
+        Update the plot PLOT_REFRESH_MS from now, unless an update is
+        already pending, so readings arriving faster than the display rate
+        share one redraw.
+        """
+        if not self._plot_update_timer.isActive():
+            self._plot_update_timer.start()
+
     def handle_new_data(
         self, sensor_values: list, current_time: float
     ) -> None:
         """
-        Handle new sensor data emitted by the SensorReader thread.
+        Handle a single new sensor reading and update the plot.
+        """
+        self.append_reading(sensor_values, current_time)
+        self.update_plot_ui()
 
+    def append_reading(
+        self, sensor_values: list, current_time: float
+    ) -> None:
+        """
         Appends new sensor values to both the dynamic window and full-session
         arrays, and maintains a rolling window for display.
         """
-        # Replace None with 0 (or another value) if desired,
-        # or handle them gracefully during calculations.
-        sensor_values = [v if v is not None else 0 for v in sensor_values]
+        # Store missing readings as NaN: the plot leaves a gap, the
+        # statistics skip them and the saved files show a blank cell.
+        sensor_values = [
+            v if v is not None else np.nan for v in sensor_values
+        ]
 
         # Ensure sensor_data arrays are at least as long as sensor_values.
         if len(sensor_values) > len(self.sensor_data):
             # Append empty lists for the new channels.
             for _ in range(len(sensor_values) - len(self.sensor_data)):
-                self.sensor_data.append(deque(maxlen=MAX_POINTS))
-                self.full_sensor_data.append(deque())
+                self.sensor_data.append(make_buffer())
+        while self.full_session.channels < len(sensor_values):
+            self.full_session.add_channel()
 
         # Append new reading to both dynamic and full-session arrays.
         for idx, value in enumerate(sensor_values):
-            self.sensor_data[idx].append(value)
-            self.full_sensor_data[idx].append(value)
+            self.window_stats(idx).append(value)
         self.timestamps.append(current_time)
-        self.full_timestamps.append(current_time)
+        self.full_session.append(sensor_values, current_time)
 
         # Maintain a rolling window of the last TIME_WINDOW_SEC seconds.
         while (
@@ -885,15 +1117,13 @@ class SensorPlotter(QtWidgets.QMainWindow):
             self.timestamps.popleft()
             for idx in range(len(self.sensor_data)):
                 if self.sensor_data[idx]:  # Check before popping
-                    self.sensor_data[idx].popleft()
+                    self.window_stats(idx).popleft()
                 else:
                     logger.warning(
                         "Sensor data deque for index %s is empty.",
                         idx
                     )
 
-        self.update_plot_ui()
-
     def update_plot_ui(self) -> None:
         """
         Update the plot and stats display based on the current sensor data.
@@ -901,59 +1131,39 @@ class SensorPlotter(QtWidgets.QMainWindow):
         if not self.timestamps:
             return
 
-        # Convert the deque to a list to support slicing
-        timestamps_list = list(self.timestamps)
         # Determine the mini common length among timestamps & all data lists.
-        min_len = len(timestamps_list)
+        min_len = len(self.timestamps)
         for data_deque in self.sensor_data:
             min_len = min(min_len, len(data_deque))
         if min_len == 0:
             return
 
-        x_data = [t - timestamps_list[0] for t in timestamps_list[:min_len]]
+        # Copy each deque straight into a float array once and slice views,
+        # rather than building intermediate Python lists; the plot and the
+        # statistics share the arrays.
+        timestamps = np.array(self.timestamps, dtype=np.float64)
+        x_data = timestamps[:min_len] - timestamps[0]
+        y_arrays = [
+            np.array(data, dtype=np.float64)[:min_len]
+            for data in self.sensor_data
+        ]
 
-        common_length = min(len(self.lines), len(self.sensor_data))
+        common_length = min(len(self.lines), len(y_arrays))
         for idx in range(common_length):
-            y_data = list(self.sensor_data[idx])[:min_len]
-            self.lines[idx].set_data(x_data, y_data)
-        self.canvas.ax.set_xlim(0, TIME_WINDOW_SEC)
-        self.canvas.draw()
+            self.lines[idx].set_data(x_data, y_arrays[idx])
+        self.blit_plot_lines()
 
         # Update statistics labels for each sensor individually.
-        common_length = min(len(self.sensor_config), len(self.sensor_data))
+        labels_by_idx = self._stats_labels_by_idx
+        common_length = min(len(labels_by_idx), len(self.sensor_data))
         for idx in range(common_length):
-            data = list(self.sensor_data[idx])[:min_len]
-            labels = self.sensor_stats_labels.get(
-                self.sensor_config[idx]["name"]
-            )
-            if labels:
-                if data:
-                    current_val = data[-1]
-                    non_null_data = [d for d in data if d is not None]
-                    min_val = min(non_null_data) if non_null_data else None
-                    max_val = max(non_null_data) if non_null_data else None
-                    avg_val = (
-                        (sum(non_null_data) / len(non_null_data))
-                        if non_null_data
-                        else None
-                    )
-                    labels["current"].setText(
-                        f"{current_val:.2f}" if current_val is not None else ""
-                    )
-                    labels["min"].setText(
-                        f"{min_val:.2f}" if min_val is not None else ""
-                    )
-                    labels["max"].setText(
-                        f"{max_val:.2f}" if max_val is not None else ""
-                    )
-                    labels["avg"].setText(
-                        f"{avg_val:.2f}" if avg_val is not None else ""
-                    )
-                else:
-                    labels["current"].setText("")
-                    labels["min"].setText("")
-                    labels["max"].setText("")
-                    labels["avg"].setText("")
+            labels = labels_by_idx[idx]
+            data = self.sensor_data[idx]
+            if len(data) == min_len:
+                stats = self.window_stats(idx)
+                self.update_stats_labels(labels, data, stats)
+            else:
+                self.update_stats_labels(labels, y_arrays[idx])
 
     def update_plot(self) -> None:
         """
@@ -961,9 +1171,61 @@ class SensorPlotter(QtWidgets.QMainWindow):
         """
         pass
 
-    def save_data(self) -> None:
+    def session_frame(
+        self, timestamps: np.ndarray, data: np.ndarray
+    ) -> pd.DataFrame:
+        """
+        Build the DataFrame saved for session readings.
+
+        Args:
+            timestamps (np.ndarray): Unix timestamps, shape (n,).
+            data (np.ndarray): Readings, one row per sensor, shape
+                (sensors, n); NaN for missing readings.
+
+        Returns:
+            pd.DataFrame: A Timestamp column of local "HH:MM:SS" strings and
+            one column per sensor, rounded to whole numbers, with missing
+            readings as nulls (blank cells).
+        """
+        data_dict = {"Timestamp": format_timestamps(timestamps)}
+        for idx, sensor in enumerate(self.sensor_config[: len(data)]):
+            data_dict[sensor["name"]] = pd.array(
+                np.rint(data[idx]), dtype="Int64"
+            )
+        return pd.DataFrame(data_dict)
+
+    def save_all_data(self) -> None:
         """
-        Save the recent data (in the current rolling window) to an Excel file.
+        Save the rolling window and the full session.
+
+        The session's DataFrame is built once. While recording, the rolling
+        window holds the session's latest readings, so its file is written
+        from the last rows of that DataFrame.
+        """
+        # Read the whole session back once; rows of data are channels.
+        timestamps, data = self.full_session.arrays()
+        frame = self.session_frame(timestamps, data)
+        window = self.timestamps
+        recent = len(window)
+        if (
+            0 < recent <= len(timestamps)
+            and timestamps[-recent] == window[0]
+            and timestamps[-1] == window[-1]
+            and all(len(values) == recent for values in self.sensor_data)
+        ):
+            self.save_data(frame.iloc[-recent:])
+        else:
+            self.save_data()
+        self.save_full_session_data(frame)
+
+    def save_data(self, df: Optional[pd.DataFrame] = None) -> None:
+        """
+        Save the recent data (in the current rolling window) to a file in
+        the configured save format.
+
+        Args:
+            df (pd.DataFrame): Opt; the window's rows, as built by
+                session_frame(). Built from the window if not given.
         """
         if not self.timestamps:
             logger.info("No recent data to save.")
@@ -972,76 +1234,60 @@ class SensorPlotter(QtWidgets.QMainWindow):
         logs_dir = os.path.join(os.getcwd(), "logs")
         os.makedirs(logs_dir, exist_ok=True)
 
-        timestamps_list = list(self.timestamps)
-        min_len = len(timestamps_list)
-        truncated_timestamps = timestamps_list[:min_len]
-        data_dict = {
-            "Timestamp": [
-                datetime.fromtimestamp(ts).strftime("%H:%M:%S")
-                for ts in truncated_timestamps
-            ]
-        }
-
-        for idx, sensor in enumerate(self.sensor_config):
-            truncated_data = list(self.sensor_data[idx])[:min_len]
-            data_dict[sensor["name"]] = [
-                round(x) if x is not None else None for x in truncated_data
-            ]
-
-        data_dict = self.pad_dict_list(data_dict)
-        df = pd.DataFrame(data_dict)
+        if df is None:
+            timestamps = np.asarray(self.timestamps, dtype=np.float64)
+            min_len = len(timestamps)
+            # Readings missing at the end of a shorter buffer stay NaN and
+            # are saved as blank cells.
+            data = np.full((len(self.sensor_config), min_len), np.nan)
+            for idx, values in enumerate(self.sensor_data[: len(data)]):
+                column = np.array(values, dtype=np.float64)[:min_len]
+                data[idx, : len(column)] = column
+            df = self.session_frame(timestamps, data)
+        save_format = load_save_format()
         file_name = os.path.join(
-            logs_dir, f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.xlsx"
+            logs_dir,
+            f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{save_format}"
         )
         try:
-            df.to_excel(file_name, index=False)
+            _DATA_FRAME_WRITERS[save_format](df, file_name)
             logger.info("Recent data saved to %s", file_name)
             self.update_status_line_with_default("FileSaved")
         except Exception as e:
             logger.error("Error saving data to %s: %s", file_name, e)
             self.update_status_line_with_default("FileSaveError")
         # Reset sensor data with new deques.
-        self.sensor_data = [
-            deque(maxlen=MAX_POINTS)
-            for _ in self.sensor_config
-        ]
-        self.timestamps = deque(maxlen=MAX_POINTS)
+        self.sensor_data = [make_buffer() for _ in self.sensor_config]
+        self.timestamps = make_buffer()
 
-    def save_full_session_data(self) -> None:
+    def save_full_session_data(
+        self, df: Optional[pd.DataFrame] = None
+    ) -> None:
         """
-        Save the full session sensor data to an Excel file.
+        Save the full session sensor data to a file in the configured save
+        format.
+
+        Args:
+            df (pd.DataFrame): Opt; the session as built by session_frame().
+                Built from full_session if not given.
         """
-        if not self.full_timestamps:
+        if df is None:
+            df = self.session_frame(*self.full_session.arrays())
+        if df.empty:
             logger.info("No full session data to save.")
             return
 
-        full_dir = os.path.join(os.getcwd(), "logs", "Excel_full")
+        full_dir = os.path.join(os.getcwd(), "logs", "full_data")
         os.makedirs(full_dir, exist_ok=True)
 
-        timestamps_full_list = list(self.full_timestamps)
-        data_dict = {
-            "Timestamp": [
-                datetime.fromtimestamp(ts).strftime("%H:%M:%S")
-                for ts in timestamps_full_list
-            ]
-        }
-
-        for idx, sensor in enumerate(self.sensor_config):
-            truncated_data = list(self.full_sensor_data[idx])[
-                : len(timestamps_full_list)
-            ]
-            data_dict[sensor["name"]] = [
-                round(x) if x is not None else None for x in truncated_data
-            ]
-
-        data_dict = self.pad_dict_list(data_dict)
-        df = pd.DataFrame(data_dict)
+        save_format = load_save_format()
         file_name = os.path.join(
             full_dir,
-            f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_full.xlsx"
+            f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_full"
+            f".{save_format}"
         )
         try:
-            df.to_excel(file_name, index=False)
+            _DATA_FRAME_WRITERS[save_format](df, file_name)
             logger.info("Full session data saved to %s", file_name)
             self.update_status_line_with_default("FullFileSaved")
         except Exception as e:
@@ -1068,6 +1314,7 @@ class SensorPlotter(QtWidgets.QMainWindow):
             except Exception:
                 pass
             self.sensor_worker = None
+            self.deliver_pending_batches()
 
         # Stop and clear the sensor_timer.
         if hasattr(self, "sensor_timer") and self.sensor_timer is not None:
@@ -1085,8 +1332,8 @@ class SensorPlotter(QtWidgets.QMainWindow):
 
         # Save data and disconnect modbus client.
         if self.modbus_client:
-            self.save_data()  # Save the last 5 minutes of data
-            self.save_full_session_data()  # Save all session data
+            # Save the last 5 minutes of data and all session data.
+            self.save_all_data()
             try:
                 self.modbus_client.close()
             except Exception:
@@ -3,7 +3,6 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 
 import pytest
 from PyQt5 import QtWidgets, QtCore
-from ui import SensorPlotter
 from PyQt5.QtCore import QThreadPool
 
 # Session-scoped QApplication fixture to ensure a single instance across tests.
@@ -16,18 +15,32 @@ def qt_app():
 # Disable background tasks that use QThreadPool.
 @pytest.fixture(autouse=True)
 def disable_background_tasks(monkeypatch):
+    from config import config_writer
     monkeypatch.setattr(QThreadPool.globalInstance(), "start", lambda task: None)
+    monkeypatch.setattr(config_writer(), "start", lambda task: None)
+
+# The UI stack is imported lazily so tests that never build a window don't
+# pay for importing matplotlib and pymodbus. The GUI test modules import ui
+# themselves; tests/non_gui imports it only inside the tests that need it.
+def _plotter_class(request):
+    """Return SensorPlotter if this test may create one, else None."""
+    if "sensor_plotter" not in request.fixturenames and "ui" not in sys.modules:
+        return None
+    from ui import SensorPlotter
+    return SensorPlotter
 
 # Disable file saving during tests to avoid blocking I/O.
 @pytest.fixture(autouse=True)
-def disable_file_saving(monkeypatch):
-    from ui import SensorPlotter
-    monkeypatch.setattr(SensorPlotter, "save_data", lambda self: None)
-    monkeypatch.setattr(SensorPlotter, "save_full_session_data", lambda self: None)
+def disable_file_saving(request, monkeypatch):
+    SensorPlotter = _plotter_class(request)
+    if SensorPlotter is None:
+        return
+    monkeypatch.setattr(SensorPlotter, "save_data", lambda self, df=None: None)
+    monkeypatch.setattr(SensorPlotter, "save_full_session_data", lambda self, df=None: None)
 
 # Dummy worker for sensor data simulation.
 class DummySensorWorker(QtCore.QObject):
-    data_ready = QtCore.pyqtSignal(list, float)
+    data_ready = QtCore.pyqtSignal(list, list)
     _running = False  # Added _running attribute
 
     def start(self):
@@ -38,7 +51,11 @@ class DummySensorWorker(QtCore.QObject):
 
 # New closeEvent override that mimics cleanup but without triggering file-saving tasks.
 @pytest.fixture(autouse=True)
-def disable_close_event(monkeypatch):
+def disable_close_event(request, monkeypatch):
+    SensorPlotter = _plotter_class(request)
+    if SensorPlotter is None:
+        return
+
     def dummy_close_event(self, event):
         # Stop and clear sensor_worker.
         if hasattr(self, "sensor_worker") and self.sensor_worker is not None:
@@ -63,6 +80,7 @@ def disable_close_event(monkeypatch):
 # Fixture providing a SensorPlotter instance with dummy worker.
 @pytest.fixture
 def sensor_plotter(qtbot):
+    from ui import SensorPlotter
     window = SensorPlotter()
     qtbot.addWidget(window)
     window.sensor_worker = DummySensorWorker()
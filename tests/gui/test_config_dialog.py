@@ -26,4 +26,18 @@ def test_open_config_dialog(qtbot, qt_app):
     
     # Wait for dialog with explicit widget check
     qtbot.waitUntil(dialog_check, timeout=3000)
-    assert dialog_created, "ConfigDialog was not created"
\ No newline at end of file
+    assert dialog_created, "ConfigDialog was not created"
+
+@pytest.mark.gui
+def test_save_changes_renames_legend_entry_in_place(sensor_plotter, monkeypatch):
+    """Saving a renamed sensor edits the existing legend entry."""
+    monkeypatch.setattr("dialog.save_sensor_config", lambda config: None)
+    dialog = ConfigDialog(sensor_plotter)
+    dialog._populate_rows()
+    legend = sensor_plotter.canvas.ax.get_legend()
+
+    dialog.sensor_entries[0]["name"].setText("Renamed")
+    dialog.save_changes()
+
+    assert sensor_plotter.canvas.ax.get_legend() is legend
+    assert legend.texts[0].get_text() == "Renamed"
@@ -78,3 +78,81 @@ def test_continuous_sensor_readings(sensor_plotter, dummy_sensor, qtbot):
     # Verify that each sensor's data list has at least 3 readings.
     for data in sensor_plotter.sensor_data:
         assert len(data) >= 3, "Expected at least 3 sensor readings in each data list."
+
+
+@pytest.mark.gui
+def test_batches_share_one_plot_update(sensor_plotter, qtbot, monkeypatch):
+    """
+    Batches arriving in quick succession are drawn with a single update.
+    """
+    updates = []
+    monkeypatch.setattr(
+        sensor_plotter, "update_plot_ui", lambda: updates.append(1)
+    )
+    # The timer is connected to the original method; reconnect it.
+    sensor_plotter._plot_update_timer.timeout.disconnect()
+    sensor_plotter._plot_update_timer.timeout.connect(
+        sensor_plotter.update_plot_ui
+    )
+    n = len(sensor_plotter.sensor_config)
+    for i in range(3):
+        sensor_plotter.handle_new_batch([[100.0] * n], [float(i)])
+
+    assert len(sensor_plotter.timestamps) == 3
+    qtbot.waitUntil(lambda: updates == [1], timeout=1000)
+    qtbot.wait(50)
+    assert updates == [1]
+
+
+@pytest.mark.gui
+def test_stop_delivers_last_batch_before_saving(sensor_plotter, qtbot):
+    """
+    Readings the worker flushes while stopping reach the plotter before
+    stop_modbus returns, so the save started there includes them.
+    """
+    import time
+    from unittest.mock import Mock
+    from sensor import Sensor
+    from sensor_worker import SensorWorker
+
+    sensor = Mock(spec=Sensor)
+    sensor.get_reading.return_value = ([100.0], time.time())
+    worker = SensorWorker(sensor, 10, emit_interval=60000)
+    worker.data_ready.connect(sensor_plotter.handle_new_batch)
+    sensor_plotter.sensor_worker = worker
+    sensor_plotter.timestamps = []
+    worker.start()
+    qtbot.waitUntil(lambda: sensor.get_reading.call_count >= 3, timeout=2000)
+
+    sensor_plotter.stop_modbus()
+
+    assert len(sensor_plotter.timestamps) == sensor.get_reading.call_count
+
+
+@pytest.mark.gui
+def test_stop_leaves_other_queued_calls_alone(sensor_plotter):
+    """
+    Delivering the worker's last batch does not run queued calls meant for
+    other objects in the middle of stop_modbus.
+    """
+    from PyQt5 import QtCore, QtWidgets
+
+    class Receiver(QtCore.QObject):
+        called = False
+
+        @QtCore.pyqtSlot()
+        def on_ping(self):
+            self.called = True
+
+    class Sender(QtCore.QObject):
+        ping = QtCore.pyqtSignal()
+
+    receiver, sender = Receiver(), Sender()
+    sender.ping.connect(receiver.on_ping, QtCore.Qt.QueuedConnection)
+    sender.ping.emit()
+
+    sensor_plotter.stop_modbus()
+    assert not receiver.called
+
+    QtWidgets.QApplication.processEvents()
+    assert receiver.called
@@ -14,3 +14,34 @@ def test_add_cursor(sensor_plotter):
     assert (
         sensor_plotter.cursor is not None
     ), "SensorPlotter.cursor is None after add_cursor()."
+
+
+@pytest.mark.gui
+def test_motion_updates_are_coalesced(sensor_plotter, monkeypatch):
+    """
+    Mouse moves only schedule the annotation update, which redraws the
+    plot only when an annotation's visibility changes.
+    """
+    from types import SimpleNamespace
+    from matplotlib.text import Annotation
+
+    annotation = Annotation("", (0, 0))
+    sel = SimpleNamespace(target=(0, 0), annotation=annotation)
+    sensor_plotter.cursor = SimpleNamespace(selections=[sel])
+    draws = []
+    monkeypatch.setattr(
+        sensor_plotter.canvas, "draw_idle", lambda: draws.append(1)
+    )
+    x, y = sensor_plotter.canvas.ax.transData.transform((0, 0))
+
+    for offset in range(5):
+        sensor_plotter.on_motion_notify(SimpleNamespace(x=x + offset, y=y))
+    assert sensor_plotter._motion_timer.isActive()
+    assert draws == []
+
+    sensor_plotter.update_cursor_annotations()
+    assert annotation.get_visible() and draws == []
+
+    sensor_plotter.on_motion_notify(SimpleNamespace(x=x + 100, y=y))
+    sensor_plotter.update_cursor_annotations()
+    assert not annotation.get_visible() and draws == [1]
@@ -21,8 +21,11 @@ def mock_sensor():
 
 @pytest.fixture
 def worker(mock_sensor):
-    """Worker instance with mock sensor"""
-    return SensorWorker(mock_sensor, 100)
+    """Worker instance with mock sensor, stopped after the test"""
+    worker = SensorWorker(mock_sensor, 100)
+    yield worker
+    if worker.isRunning():
+        worker.stop()
 
 # --------------------------
 # Test Cases
@@ -82,3 +85,31 @@ def test_thread_safety(worker, qtbot):
     # Verify both internal flag and thread state
     assert not worker.is_running()
     assert not worker.isRunning()
+
+def test_data_emitted_in_batches(worker, qtbot, mock_sensor):
+    """Verify readings are batched into a single data_ready emission"""
+    with qtbot.waitSignal(worker.data_ready, timeout=1500) as blocker:
+        worker.start()
+    worker.stop()
+
+    values_batch, timestamps = blocker.args
+    assert len(values_batch) == len(timestamps) >= 1
+    assert values_batch[0] == [100.0]
+
+def test_backoff_after_failures(worker, mock_sensor):
+    """Failed polls wait for a reconnect; a good read resets the backoff"""
+    mock_sensor.get_reading.side_effect = Exception("Simulated error")
+    worker.poll()
+    assert worker._fail_count == 1
+
+    # While the client cannot reconnect, the sensor is not read.
+    mock_sensor.reconnect.return_value = False
+    worker.poll()
+    assert worker._fail_count == 2
+    assert mock_sensor.get_reading.call_count == 1
+
+    mock_sensor.reconnect.return_value = True
+    mock_sensor.get_reading.side_effect = None
+    worker.poll()
+    assert worker._fail_count == 0
+    assert mock_sensor.get_reading.call_count == 2
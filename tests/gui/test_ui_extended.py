@@ -64,6 +64,38 @@ def test_ui_reinitialize_plot_lines(qtbot):
         assert len(data) == 0, "Sensor data was not reset."
     assert len(window.timestamps) == 0, "Timestamps were not reset."
 
+
+@pytest.mark.gui
+def test_reinitialize_reuses_lines_for_same_sensor_count(qtbot):
+    """Style edits restyle the existing lines instead of rebuilding them."""
+    window = SensorPlotter()
+    qtbot.addWidget(window)
+    lines = list(window.lines)
+    window.lines[0].set_data([0, 1], [10, 20])
+    window.sensor_config[0]["color"] = "magenta"
+
+    window.reinitialize_plot_lines()
+
+    assert window.lines == lines
+    assert window.lines[0].get_color() == "magenta"
+    assert len(window.lines[0].get_xdata()) == 0
+
+
+@pytest.mark.gui
+def test_style_change_updates_legend_in_place(qtbot):
+    """Renaming a sensor edits the existing legend entry."""
+    window = SensorPlotter()
+    qtbot.addWidget(window)
+    legend = window.canvas.ax.get_legend()
+    window.sensor_config[0]["name"] = "Renamed"
+    window.sensor_config[0]["color"] = "magenta"
+
+    window.update_line_styles()
+
+    assert window.canvas.ax.get_legend() is legend
+    assert legend.texts[0].get_text() == "Renamed"
+    assert legend.legend_handles[0].get_color() == "magenta"
+
 @pytest.mark.gui
 def test_status_line_update(qtbot):
     """Verify status line auto-resets after delay"""
@@ -81,4 +113,112 @@ def test_status_line_update(qtbot):
     qtbot.waitUntil(
         lambda: "Ready" in window.status_label.text(),
         timeout=500  # 500ms = 100ms delay + 400ms buffer
-    )
\ No newline at end of file
+    )
+
+@pytest.mark.gui
+def test_update_com_ports_keeps_selection(qtbot, monkeypatch):
+    """A port list change rebuilds the combo box but keeps the selection."""
+    import serial.tools.list_ports
+    from types import SimpleNamespace
+
+    window = SensorPlotter()
+    qtbot.addWidget(window)
+    ports = ["COM1", "COM3"]
+    monkeypatch.setattr(
+        serial.tools.list_ports,
+        "comports",
+        lambda: [SimpleNamespace(device=name) for name in ports],
+    )
+    window.update_com_ports()
+    window.com_port_combo.setCurrentText("COM3")
+
+    ports.insert(1, "COM2")
+    window.update_com_ports()
+    assert window.com_port_combo.currentText() == "COM3"
+    assert window.com_port_combo.count() == 3
+
+    ports.clear()
+    window.update_com_ports()
+    assert window.com_port_combo.count() == 0
+    assert not window.start_button.isEnabled()
+
+
+@pytest.mark.gui
+def test_stats_labels_follow_sensor_index(sensor_plotter):
+    """
+    Each sensor's statistics labels show that sensor's readings.
+    """
+    n = len(sensor_plotter.sensor_config)
+    sensor_plotter.timestamps = [1, 2]
+    sensor_plotter.sensor_data = [[idx, 10 + idx] for idx in range(n)]
+    sensor_plotter.update_plot_ui()
+
+    for idx, sensor in enumerate(sensor_plotter.sensor_config):
+        labels = sensor_plotter.sensor_stats_labels[sensor["name"]]
+        assert labels["min"].text() == f"{idx:.2f}"
+        assert labels["max"].text() == f"{10 + idx:.2f}"
+
+
+@pytest.mark.gui
+def test_missing_readings_are_not_counted_as_zero(sensor_plotter):
+    """
+    A failed read is stored as NaN, so it is left out of the statistics and
+    saved as a null rather than a zero.
+    """
+    import numpy as np
+
+    n = len(sensor_plotter.sensor_config)
+    sensor_plotter.append_reading([10.0] * n, 1.0)
+    sensor_plotter.append_reading([None] * n, 2.0)
+    sensor_plotter.append_reading([20.0] * n, 3.0)
+    sensor_plotter.update_plot_ui()
+
+    labels = sensor_plotter.sensor_stats_labels[
+        sensor_plotter.sensor_config[0]["name"]
+    ]
+    assert labels["min"].text() == "10.00"
+    assert labels["avg"].text() == "15.00"
+
+    timestamps, data = sensor_plotter.full_session.arrays()
+    frame = sensor_plotter.session_frame(timestamps, data)
+    assert frame.iloc[1, 1:].isna().all()
+    assert np.isnan(sensor_plotter.lines[0].get_ydata()[1])
+
+
+@pytest.mark.gui
+def test_format_timestamps_matches_strftime():
+    import numpy as np
+    from datetime import datetime
+    from ui import format_timestamps
+
+    timestamps = np.array([1700000000.0, 1700000000.9, 1700000001.2])
+    assert format_timestamps(timestamps) == [
+        datetime.fromtimestamp(ts).strftime("%H:%M:%S") for ts in timestamps
+    ]
+
+
+@pytest.mark.gui
+def test_save_all_data_shares_session_frame(sensor_plotter, monkeypatch):
+    """
+    The window file is written from the last rows of the session frame.
+    """
+    saved = {}
+    monkeypatch.setattr(
+        SensorPlotter, "save_data",
+        lambda self, df=None: saved.setdefault("window", df),
+    )
+    monkeypatch.setattr(
+        SensorPlotter, "save_full_session_data",
+        lambda self, df=None: saved.setdefault("full", df),
+    )
+    n = len(sensor_plotter.sensor_config)
+    for i in range(4):
+        sensor_plotter.append_reading([10.0 * i] * n, float(i))
+    sensor_plotter.timestamps.popleft()
+    for idx in range(n):
+        sensor_plotter.window_stats(idx).popleft()
+
+    sensor_plotter.save_all_data()
+
+    assert len(saved["full"]) == 4
+    assert saved["window"].equals(saved["full"].iloc[1:])
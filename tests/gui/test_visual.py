@@ -18,9 +18,10 @@ def compare_with_baseline(filename: str, tolerance: float) -> bool:
     return True
 
 @pytest.mark.gui
-def test_plot_rendering(sensor_plotter, qtbot):
+def test_plot_rendering(sensor_plotter, qtbot, tmp_path):
     """Compare plot screenshots against baselines."""
     # Take a screenshot of the sensor_plotter's canvas.
-    take_screenshot(sensor_plotter.canvas, "plot_baseline.png")
+    screenshot = str(tmp_path / "plot_baseline.png")
+    take_screenshot(sensor_plotter.canvas, screenshot)
     # Assert that the screenshot matches the baseline within tolerance.
-    assert compare_with_baseline("plot_baseline.png", tolerance=0.1)
+    assert compare_with_baseline(screenshot, tolerance=0.1)
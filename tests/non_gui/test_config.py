@@ -1,12 +1,13 @@
 # tests/test_config_dialog.py
-from ui import SensorPlotter
-from dialog import ConfigDialog
 from PyQt5 import QtCore, QtWidgets
 import pytest
 
 @pytest.mark.gui  # Add this marker
 def test_open_config_dialog(qtbot, qt_app):
     """Verify config dialog opens on button click (GUI test)"""
+    from ui import SensorPlotter
+    from dialog import ConfigDialog
+
     window = SensorPlotter()
     qtbot.addWidget(window)
     
@@ -1,7 +1,7 @@
 # test_configuration_persistence.py
 import pytest
 from config import save_sensor_config, load_sensor_config, sensor_config
-from PyQt5.QtCore import QSettings
+from PyQt5.QtCore import QSettings, QThreadPool
 
 
 class DummySettings:
@@ -28,6 +28,7 @@ def dummy_qsettings(monkeypatch):
     monkeypatch.setattr(QSettings, "setValue", dummy.setValue)
     monkeypatch.setattr(QSettings, "value", dummy.value)
     monkeypatch.setattr(QSettings, "remove", dummy.remove)
+    monkeypatch.setattr(QSettings, "sync", lambda self: None)
     return dummy
 
 @pytest.mark.non_gui  # Add this marker
@@ -54,3 +55,50 @@ def test_configuration_persistence(dummy_qsettings):
     assert (
         loaded_config == new_config
     ), "Loaded configuration does not match saved configuration."
+
+
+@pytest.mark.non_gui
+def test_loaded_config_is_independent_copy(dummy_qsettings):
+    """
+    Editing a loaded configuration must not change the cache or defaults.
+    """
+    save_sensor_config(sensor_config)
+    loaded_config = load_sensor_config(sensor_config)
+    loaded_config[0]["name"] = "Edited"
+
+    assert sensor_config[0]["name"] != "Edited"
+    assert load_sensor_config(sensor_config)[0]["name"] != "Edited"
+
+
+@pytest.mark.non_gui
+def test_save_format_setting(dummy_qsettings):
+    from config import (
+        DEFAULT_SAVE_FORMAT,
+        SETTINGS_KEY_SAVE_FORMAT,
+        load_save_format,
+    )
+
+    assert load_save_format() == DEFAULT_SAVE_FORMAT
+    dummy_qsettings.setValue(SETTINGS_KEY_SAVE_FORMAT, "XLSX")
+    assert load_save_format() == "xlsx"
+    dummy_qsettings.setValue(SETTINGS_KEY_SAVE_FORMAT, "doc")
+    assert load_save_format() == DEFAULT_SAVE_FORMAT
+
+
+@pytest.mark.non_gui
+def test_config_writes_run_in_submission_order(dummy_qsettings):
+    """
+    A reset followed by a save must leave the saved configuration stored.
+    """
+    from config import config_writer, reset_sensor_config
+    from save_tasks import SaveTask
+
+    new_config = [dict(sensor_config[0], name="Saved After Reset")]
+    writer = config_writer()
+    assert writer.maxThreadCount() == 1
+    # conftest stubs the instance's start(); call the class method instead.
+    QThreadPool.start(writer, SaveTask(reset_sensor_config))
+    QThreadPool.start(writer, SaveTask(lambda: save_sensor_config(new_config)))
+    assert writer.waitForDone(5000)
+
+    assert load_sensor_config(sensor_config) == new_config
@@ -0,0 +1,47 @@
+# test_rolling_stats.py
+import random
+
+import pytest
+from collections import deque
+
+from rolling_stats import RollingStats
+
+
+@pytest.mark.non_gui
+def test_rolling_stats_match_window():
+    buffer = deque(maxlen=5)
+    stats = RollingStats(buffer)
+    rng = random.Random(0)
+    for i in range(50):
+        stats.append(rng.uniform(-10, 10))
+        if i % 7 == 6:
+            stats.popleft()
+        assert stats.in_sync(buffer)
+        assert stats.current() == buffer[-1]
+        assert stats.minimum() == min(buffer)
+        assert stats.maximum() == max(buffer)
+        assert stats.mean() == pytest.approx(sum(buffer) / len(buffer))
+
+
+@pytest.mark.non_gui
+def test_rolling_stats_skip_missing_values():
+    buffer = [None, 4, None, 2]
+    stats = RollingStats(buffer)
+    assert (stats.minimum(), stats.maximum(), stats.mean()) == (2, 4, 3)
+
+    buffer.append(1)
+    assert not stats.in_sync(buffer)
+    assert RollingStats(buffer).minimum() == 1
+    assert RollingStats([None]).mean() is None
+
+
+@pytest.mark.non_gui
+def test_rolling_stats_skip_nan():
+    buffer = deque([float("nan"), 4.0, 2.0], maxlen=3)
+    stats = RollingStats(buffer)
+    assert (stats.minimum(), stats.maximum(), stats.mean()) == (2, 4, 3)
+
+    for _ in range(3):
+        stats.append(float("nan"))
+    assert (stats.minimum(), stats.maximum()) == (None, None)
+    assert stats.mean() is None
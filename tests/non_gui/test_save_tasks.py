@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+from save_tasks import SaveTask
+
+
+@pytest.mark.non_gui
+def test_save_task_runs_function():
+    calls = []
+
+    SaveTask(lambda: calls.append("saved")).run()
+
+    assert calls == ["saved"]
+
+
+@pytest.mark.non_gui
+def test_save_task_logs_errors(caplog):
+    def failing_save():
+        raise OSError("disk full")
+
+    with caplog.at_level(logging.ERROR, logger="save_tasks"):
+        SaveTask(failing_save).run()
+
+    assert "disk full" in caplog.text
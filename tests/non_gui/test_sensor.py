@@ -1,7 +1,8 @@
 import pytest
-from sensor import Sensor
+from sensor import Sensor, SensorError
 from config import ADC_MAX, VOLTAGE_FULL_SCALE, POLL_INTERVAL_MS
 from datetime import datetime
+from pymodbus.pdu import ExceptionResponse
 
 
 # --- Fake Modbus Response and Client for Testing ---
@@ -62,3 +63,267 @@ def test_sensor_get_reading(sensor_config_test, fake_modbus_client):
         abs(sensor_values[0] - 300) < 5
     ), f"Expected sensor value close to 300, got {sensor_values[0]}"
     assert isinstance(timestamp, float)
+
+
+class FakeBlockModbusClient:
+    """Returns registers 0..count-1 as 1000, 1100, 1200, ..."""
+
+    def __init__(self):
+        self.calls = []
+
+    def read_holding_registers(self, address, count, slave):
+        self.calls.append((address, count))
+        return FakeModbusResponse(
+            [1000 + 100 * (address + i) for i in range(count)]
+        )
+
+    def close(self):
+        pass
+
+
+@pytest.mark.non_gui
+def test_sensor_reads_all_channels_in_one_request():
+    config = [
+        {"channel": 4, "scale": 600, "offset": 0, "calibration": 1},
+        {"channel": 2, "scale": 600, "offset": 0, "calibration": 1},
+    ]
+    client = FakeBlockModbusClient()
+    sensor = Sensor(config, client)
+    sensor_values, _ = sensor.get_reading()
+
+    # One transaction covering channels 2..4 (addresses 1..3).
+    assert client.calls == [(1, 3)]
+    assert sensor_values[0] == pytest.approx(1300 * 600 / ADC_MAX)
+    assert sensor_values[1] == pytest.approx(1100 * 600 / ADC_MAX)
+
+
+@pytest.mark.non_gui
+def test_sensor_get_reading_with_mutex(sensor_config_test, fake_modbus_client):
+    locked = Sensor(sensor_config_test, fake_modbus_client, use_mutex=True)
+    unlocked = Sensor(sensor_config_test, fake_modbus_client)
+
+    assert locked.get_reading()[0] == unlocked.get_reading()[0]
+    assert not locked.mutex.locked()
+
+
+@pytest.mark.non_gui
+def test_sensor_splits_distant_channels_into_separate_requests():
+    config = [
+        {"channel": 20, "scale": 600, "offset": 0, "calibration": 1},
+        {"channel": 1, "scale": 600, "offset": 0, "calibration": 1},
+        {"channel": 3, "scale": 600, "offset": 0, "calibration": 1},
+    ]
+    client = FakeBlockModbusClient()
+    sensor = Sensor(config, client, max_gap=4)
+    sensor_values, _ = sensor.get_reading()
+
+    # Channels 1 and 3 share a request; channel 20 is read on its own.
+    assert client.calls == [(0, 3), (19, 1)]
+    assert sensor_values[0] == pytest.approx(2900 * 600 / ADC_MAX)
+    assert sensor_values[1] == pytest.approx(1000 * 600 / ADC_MAX)
+    assert sensor_values[2] == pytest.approx(1200 * 600 / ADC_MAX)
+
+
+@pytest.mark.non_gui
+def test_sensor_reconnects_dropped_client(sensor_config_test):
+    class DroppingClient(FakeModbusClient):
+        def __init__(self, can_connect):
+            self.connected = False
+            self.can_connect = can_connect
+
+        def connect(self):
+            self.connected = self.can_connect
+            return self.can_connect
+
+    client = DroppingClient(can_connect=True)
+    sensor_values, _ = Sensor(sensor_config_test, client).get_reading()
+    assert client.connected
+    assert sensor_values[0] is not None
+
+    with pytest.raises(SensorError):
+        Sensor(sensor_config_test, DroppingClient(False)).get_reading()
+
+
+@pytest.mark.non_gui
+def test_reconnect_holds_bus_lock(sensor_config_test):
+    from sensor import SensorBus
+
+    class LockCheckingClient(FakeModbusClient):
+        connected = False
+
+        def connect(self):
+            self.locked = bus.mutex.locked()
+            return True
+
+    client = LockCheckingClient()
+    bus = SensorBus(client)
+    assert bus.make_sensor(sensor_config_test).reconnect()
+    assert client.locked
+
+
+@pytest.mark.non_gui
+def test_sensor_disables_nagle_on_tcp_socket(sensor_config_test):
+    import socket
+
+    client = FakeModbusClient()
+    client.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        Sensor(sensor_config_test, client)
+        assert client.socket.getsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY
+        )
+    finally:
+        client.socket.close()
+
+
+@pytest.mark.non_gui
+def test_cancel_reads_skips_retry_backoff(sensor_config_test):
+    import time
+    from sensor import ReadCancelled
+
+    class FailingClient(FakeModbusClient):
+        def read_holding_registers(self, address, count, slave):
+            return None
+
+    sensor = Sensor(sensor_config_test, FailingClient())
+    sensor.cancel_reads()
+    start = time.monotonic()
+    with pytest.raises(ReadCancelled):
+        sensor.get_reading()
+    assert time.monotonic() - start < 1
+
+    sensor.resume_reads()
+    assert sensor._cancel_event.is_set() is False
+
+
+@pytest.mark.non_gui
+def test_readings_do_not_share_output(sensor_config_test, fake_modbus_client):
+    sensor = Sensor(sensor_config_test, fake_modbus_client)
+    first, _ = sensor.get_reading()
+    second, _ = sensor.get_reading()
+    first[0] = -1.0
+    assert second[0] != -1.0
+
+
+@pytest.mark.non_gui
+def test_failed_read_retries_on_short_schedule(sensor_config_test):
+    import time
+
+    class FailingClient(FakeModbusClient):
+        def __init__(self):
+            self.calls = 0
+
+        def read_holding_registers(self, address, count, slave):
+            self.calls += 1
+            return None
+
+    client = FailingClient()
+    sensor = Sensor(sensor_config_test, client, retry_delays=(1, 2))
+    start = time.monotonic()
+    sensor_values, _ = sensor.get_reading()
+    assert time.monotonic() - start < 0.5
+    # One block attempt, then three per-channel attempts.
+    assert client.calls == 4
+    assert sensor_values == [None]
+
+
+@pytest.mark.non_gui
+def test_duplicate_channels_share_one_read(sensor_config_test):
+    class SingleRegisterClient(FakeModbusClient):
+        def __init__(self):
+            self.calls = []
+
+        def read_holding_registers(self, address, count, slave):
+            self.calls.append((address, count))
+            # Only single-register requests succeed.
+            if count != 1:
+                return None
+            return FakeModbusResponse([2002])
+
+    config = sensor_config_test + [
+        dict(sensor_config_test[0], name="Doubled", calibration=2),
+        dict(sensor_config_test[0], name="Other", channel=2),
+    ]
+    client = SingleRegisterClient()
+    sensor_values, _ = Sensor(config, client).get_reading()
+
+    # One block attempt, then one read per distinct channel.
+    assert client.calls == [(0, 2), (0, 1), (1, 1)]
+    assert sensor_values[1] == pytest.approx(2 * sensor_values[0])
+    assert sensor_values[2] == pytest.approx(sensor_values[0])
+
+
+@pytest.mark.non_gui
+def test_sensor_bus_shares_client_and_lock(sensor_config_test, fake_modbus_client):
+    from sensor import SensorBus
+
+    bus = SensorBus(fake_modbus_client)
+    first = bus.make_sensor(sensor_config_test)
+    second = bus.make_sensor([dict(sensor_config_test[0], channel=5)])
+
+    assert first.modbus_client is second.modbus_client is fake_modbus_client
+    assert first.mutex is second.mutex is bus.mutex
+    assert first.get_reading()[0] == second.get_reading()[0]
+
+
+@pytest.mark.non_gui
+def test_rejected_block_is_split_for_later_polls():
+    class GapRejectingClient(FakeBlockModbusClient):
+        """Rejects any request that covers the unconfigured address 1."""
+
+        def read_holding_registers(self, address, count, slave):
+            self.calls.append((address, count))
+            if address <= 1 < address + count:
+                return ExceptionResponse(
+                    3, ExceptionResponse.ILLEGAL_ADDRESS
+                )
+            return FakeModbusResponse(
+                [1000 + 100 * (address + i) for i in range(count)]
+            )
+
+    config = [
+        {"channel": 1, "scale": 600, "offset": 0, "calibration": 1},
+        {"channel": 3, "scale": 600, "offset": 0, "calibration": 1},
+    ]
+    client = GapRejectingClient()
+    sensor = Sensor(config, client, retry_delays=(1,))
+    first, _ = sensor.get_reading()
+    assert client.calls == [(0, 3), (0, 1), (2, 1)]
+
+    client.calls.clear()
+    second, _ = sensor.get_reading()
+    # The block spanning the gap is no longer requested.
+    assert client.calls == [(0, 1), (2, 1)]
+    assert second == first
+    assert second[1] == pytest.approx(1200 * 600 / ADC_MAX)
+
+
+@pytest.mark.non_gui
+def test_timed_out_block_is_still_read_as_one_block():
+    class TimingOutClient(FakeBlockModbusClient):
+        """Times out on the first block request only."""
+
+        timed_out = False
+
+        def read_holding_registers(self, address, count, slave):
+            self.calls.append((address, count))
+            if count > 1 and not self.timed_out:
+                self.timed_out = True
+                return None
+            return FakeModbusResponse(
+                [1000 + 100 * (address + i) for i in range(count)]
+            )
+
+    config = [
+        {"channel": 1, "scale": 600, "offset": 0, "calibration": 1},
+        {"channel": 3, "scale": 600, "offset": 0, "calibration": 1},
+    ]
+    client = TimingOutClient()
+    sensor = Sensor(config, client, retry_delays=(1,))
+    first, _ = sensor.get_reading()
+    assert client.calls == [(0, 3), (0, 1), (2, 1)]
+
+    client.calls.clear()
+    second, _ = sensor.get_reading()
+    assert client.calls == [(0, 3)]
+    assert second == first
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from session_store import SessionStore
+
+
+@pytest.mark.non_gui
+def test_readings_span_blocks():
+    store = SessionStore(2, block_size=4)
+    for i in range(10):
+        store.append([i, 10 * i], float(i))
+
+    assert len(store) == 10
+    timestamps, data = store.arrays()
+    assert timestamps.tolist() == [float(i) for i in range(10)]
+    assert data.shape == (2, 10)
+    assert data[1].tolist() == [10.0 * i for i in range(10)]
+
+
+@pytest.mark.non_gui
+def test_missing_readings_are_nan():
+    store = SessionStore(3, block_size=4)
+    store.append([1.0, None], 0.0)
+
+    _, data = store.arrays()
+    assert data[0, 0] == 1.0
+    assert np.isnan(data[1:, 0]).all()
+
+
+@pytest.mark.non_gui
+def test_add_and_remove_channel():
+    store = SessionStore(1, block_size=2)
+    store.append([1.0], 0.0)
+    store.append([2.0], 1.0)
+    store.add_channel()
+    store.append([3.0, 30.0], 2.0)
+
+    _, data = store.arrays()
+    assert data[0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(data[1, :2]).all() and data[1, 2] == 30.0
+
+    store.remove_channel()
+    assert store.channels == 1
+    assert store.arrays()[1].shape == (1, 3)
+
+
+@pytest.mark.non_gui
+def test_removed_channel_stays_removed_in_spilled_blocks():
+    store = SessionStore(2, block_size=2)
+    for i in range(5):
+        store.append([i, 10 * i], float(i))
+    store.remove_channel()
+    store.add_channel()
+    store.append([5.0, 50.0], 5.0)
+
+    timestamps, data = store.arrays()
+    assert timestamps.tolist() == [float(i) for i in range(6)]
+    assert data[0].tolist() == [float(i) for i in range(6)]
+    assert np.isnan(data[1, :5]).all() and data[1, 5] == 50.0